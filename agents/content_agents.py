@@ -1,7 +1,7 @@
 from crewai import Agent
 from config import search_tool
 
-def get_creative_director() -> Agent:
+def get_creative_director(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role='Creative Director',
         goal='Create compelling visual concepts optimized for Leonardo.ai generation',
@@ -10,10 +10,10 @@ def get_creative_director() -> Agent:
         Leonardo.ai's strengths in realistic photography, cinematic imagery, and 
         high-detail compositions.""",
         verbose=True,
-        llm_model="gpt-4"
+        llm=llm_model
     )
 
-def get_visual_prompt_expert() -> Agent:
+def get_visual_prompt_expert(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role='Leonardo.ai Prompt Expert',
         goal='Create highly optimized prompts for Leonardo.ai image generation',
@@ -21,10 +21,10 @@ def get_visual_prompt_expert() -> Agent:
         image generation capabilities. You understand how to craft prompts that maximize 
         photorealism, lighting, and composition while avoiding common AI artifacts.""",
         verbose=True,
-        llm_model="gpt-4"
+        llm=llm_model
     )
 
-def get_content_strategist() -> Agent:
+def get_content_strategist(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role='Content Strategy Expert',
         goal='Develop engaging content concepts based on market research',
@@ -32,10 +32,10 @@ def get_content_strategist() -> Agent:
         media campaigns. You understand how to translate brand values into visually 
         compelling content that resonates with target audiences.""",
         verbose=True,
-        llm_model="gpt-4"
+        llm=llm_model
     )
 
-def get_visual_director() -> Agent:
+def get_visual_director(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role='Visual Creative Director',
         goal='Create detailed visual concepts optimized for Leonardo.ai generation',
@@ -43,10 +43,10 @@ def get_visual_director() -> Agent:
         social media content. You excel at creating concepts that leverage Leonardo.ai's 
         strengths in photorealistic imagery while maintaining brand authenticity.""",
         verbose=True,
-        llm_model="gpt-4"
+        llm=llm_model
     )
 
-def get_leonardo_expert() -> Agent:
+def get_leonardo_expert(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role='Leonardo.ai Expert',
         goal='Optimize prompts for hyper-realistic marketing imagery',
@@ -54,5 +54,5 @@ def get_leonardo_expert() -> Agent:
         You excel at creating prompts that generate consistent, professional marketing 
         content with human subjects and lifestyle imagery.""",
         verbose=True,
-        llm_model="gpt-4"
+        llm=llm_model
     )
\ No newline at end of file
@@ -1,7 +1,7 @@
 from crewai import Agent
 from config import search_tool
 
-def get_market_researcher() -> Agent:
+def get_market_researcher(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role="Market Research Specialist",
         goal="Deliver scalable market insights for businesses of any size",
@@ -13,10 +13,10 @@ def get_market_researcher() -> Agent:
         verbose=True,
         tools=[search_tool],
         allow_delegation=False,
-        llm_model="gpt-4"
+        llm=llm_model
     )
 
-def get_business_planner() -> Agent:
+def get_business_planner(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role="Strategic Business Planning Expert",
         goal="Create scale-appropriate business plans with realistic execution paths",
@@ -26,10 +26,10 @@ def get_business_planner() -> Agent:
         Adapts planning approach based on business maturity and available resources.""",
         tools=[search_tool],
         verbose=True,
-        llm_model="gpt-4"
+        llm=llm_model
     )
 
-def get_social_media_strategist() -> Agent:
+def get_social_media_strategist(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role="Digital Strategy Director",
         goal="Create data-backed social media strategies that drive engagement and conversion",
@@ -39,5 +39,5 @@ def get_social_media_strategist() -> Agent:
         verbose=True,
         tools=[search_tool],
         allow_delegation=False,
-        llm_model="gpt-4"
+        llm=llm_model
     )
\ No newline at end of file
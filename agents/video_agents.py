@@ -1,17 +1,18 @@
 from crewai import Agent
 from config import search_tool
 
-def get_video_prompt_agent() -> Agent:
+def get_video_prompt_agent(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role='Video Motion Expert',
         goal='Create compelling video motion prompts following Runway guidelines',
         backstory="""You are an expert in creating video motion prompts that bring static images 
         to life. You understand Runway's Gen-3 Alpha model capabilities and follow their 
         prompting best practices.""",
-        verbose=True
+        verbose=True,
+        llm=llm_model
     )
 
-def get_runway_researcher() -> Agent:
+def get_runway_researcher(llm_model: str = "gpt-4") -> Agent:
     return Agent(
         role='Runway Documentation Expert',
         goal='Research and master Runway Gen-3 Alpha prompting best practices',
@@ -20,5 +21,5 @@ def get_runway_researcher() -> Agent:
         and limitations. You focus on creating cinematic, hyper-realistic motion effects.""",
         tools=[search_tool],
         verbose=True,
-        llm_model="gpt-4"
+        llm=llm_model
     )
\ No newline at end of file
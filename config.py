@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from crewai_tools import SerperDevTool
+from services.cached_search import CachedSerperDevTool
 
 # Load environment variables from .env file
 load_dotenv()
@@ -19,13 +19,69 @@ os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
 os.environ["RUNWAYML_API_SECRET"] = RUNWAY_API_SECRET
 os.environ["SERPER_API_KEY"] = SERPER_API_KEY
 
+# Upstream endpoints, overridable to point the app at local stand-ins (see loadtest/).
+# The OpenAI and RunwayML SDKs read OPENAI_BASE_URL and RUNWAYML_BASE_URL themselves.
+LEONARDO_BASE_URL = os.getenv("LEONARDO_BASE_URL", "https://cloud.leonardo.ai/api/rest/v1")
+SERPER_BASE_URL = os.getenv("SERPER_BASE_URL")
+
 # Initialize tools
-search_tool = SerperDevTool(api_key=SERPER_API_KEY)
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "86400"))
+search_tool = CachedSerperDevTool(
+    api_key=SERPER_API_KEY,
+    cache_max_age=SEARCH_CACHE_TTL,
+    **({'base_url': SERPER_BASE_URL} if SERPER_BASE_URL else {})
+)
 
 # Session state initialization
 DEFAULT_SESSION_STATE = {
     'generated_image_url': None,
+    'generated_image_path': None,
     'dalle_prompt': None,
     'video_generated': False,
-    'generated_content': []
-}
\ No newline at end of file
+    'generated_content': [],
+    'jobs': {},
+    'last_export': None
+}
+
+# Worker pool limits shared by all Streamlit sessions
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", "4"))
+WORKER_PER_USER_LIMIT = int(os.getenv("WORKER_PER_USER_LIMIT", "1"))
+WORKER_QUEUE_LIMIT = int(os.getenv("WORKER_QUEUE_LIMIT", "20"))
+WORKER_JOB_TTL = int(os.getenv("WORKER_JOB_TTL", "600"))
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1"))
+# Local storage for downloaded assets and their renditions
+MEDIA_DIR = os.getenv("MEDIA_DIR", "media")
+# Model tiers used by the task router (see services/model_router.py)
+MODEL_TIERS = {
+    'premium': os.getenv("MODEL_PREMIUM", "gpt-4"),
+    'standard': os.getenv("MODEL_STANDARD", "gpt-4o"),
+    'fast': os.getenv("MODEL_FAST", "gpt-4o-mini")
+}
+MODEL_MAX_FAILURE_RATE = float(os.getenv("MODEL_MAX_FAILURE_RATE", "0.2"))
+MODEL_MIN_SAMPLES = int(os.getenv("MODEL_MIN_SAMPLES", "5"))
+MODEL_STATS_WINDOW = int(os.getenv("MODEL_STATS_WINDOW", "50"))
+MODEL_STATS_MAX_AGE = int(os.getenv("MODEL_STATS_MAX_AGE", "900"))
+# Bulk exports inside STATIC_DIR are served by Streamlit static file serving (see .streamlit/config.toml);
+# an EXPORT_DIR elsewhere falls back to an in-memory download button
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(STATIC_DIR, "exports"))
+EXPORT_TTL = int(os.getenv("EXPORT_TTL", "3600"))
+# Hedged image generation: OpenAI Images is tried once Leonardo passes this latency percentile
+OPENAI_IMAGE_MODEL = os.getenv("OPENAI_IMAGE_MODEL", "dall-e-3")
+IMAGE_HEDGE_PERCENTILE = float(os.getenv("IMAGE_HEDGE_PERCENTILE", "0.9"))
+IMAGE_HEDGE_DEFAULT_SECONDS = float(os.getenv("IMAGE_HEDGE_DEFAULT_SECONDS", "30"))
+IMAGE_HEDGE_MIN_SAMPLES = int(os.getenv("IMAGE_HEDGE_MIN_SAMPLES", "5"))
+IMAGE_HEDGE_WINDOW = int(os.getenv("IMAGE_HEDGE_WINDOW", "50"))
+
+# Research cache and off-peak pre-warming (see services/prewarm.py)
+RESEARCH_CACHE_DIR = os.getenv("RESEARCH_CACHE_DIR", os.path.join("cache", "research"))
+RESEARCH_CACHE_TTL = int(os.getenv("RESEARCH_CACHE_TTL", str(3 * 86400)))
+USAGE_HISTORY_PATH = os.getenv("USAGE_HISTORY_PATH", os.path.join("cache", "usage_history.jsonl"))
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "false").lower() == "true"
+PREWARM_SEGMENTS_FILE = os.getenv("PREWARM_SEGMENTS_FILE", "prewarm_segments.json")
+PREWARM_TOP_RECENT = int(os.getenv("PREWARM_TOP_RECENT", "20"))
+PREWARM_HISTORY_DAYS = int(os.getenv("PREWARM_HISTORY_DAYS", "14"))
+PREWARM_REFRESH_AGE = int(os.getenv("PREWARM_REFRESH_AGE", "86400"))
+PREWARM_OFF_PEAK_HOURS = os.getenv("PREWARM_OFF_PEAK_HOURS", "1-5")
+PREWARM_MAX_RUNS_PER_DAY = int(os.getenv("PREWARM_MAX_RUNS_PER_DAY", "30"))
+PREWARM_CHECK_INTERVAL = int(os.getenv("PREWARM_CHECK_INTERVAL", "600"))
\ No newline at end of file
@@ -0,0 +1,334 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from loadtest.stubs import StubServer, DEFAULT_DELAYS
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+ACTIONS = ["research", "content", "video", "influencer"]
+
+# AppTest installs a process-wide Streamlit runtime for each script run, so runs from
+# different sessions must not overlap. Time spent waiting for the lock is reported separately.
+_run_lock = threading.Lock()
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def configure_environment(stub: StubServer, work_dir: str, poll_interval: float):
+    """Point the app at the stand-ins and keep its caches out of the working tree"""
+    os.environ.update(stub.environment())
+    for key in ["OPENAI_API_KEY", "RUNWAYML_API_SECRET", "SERPER_API_KEY",
+                "LEONARDO_API_KEY", "LEONARDO_CONTENT_API_KEY"]:
+        os.environ[key] = "loadtest"
+    os.environ.update({
+        'MEDIA_DIR': os.path.join(work_dir, "media"),
+        'EXPORT_DIR': os.path.join(work_dir, "exports"),
+        'RESEARCH_CACHE_DIR': os.path.join(work_dir, "research"),
+        'USAGE_HISTORY_PATH': os.path.join(work_dir, "usage_history.jsonl"),
+        'WORKER_POLL_INTERVAL': str(poll_interval),
+        'PREWARM_ENABLED': "false",
+        'CREWAI_DISABLE_TELEMETRY': "true",
+        'OTEL_SDK_DISABLED': "true"
+    })
+
+class Session:
+    """A simulated user driving the app through its own AppTest"""
+
+    def __init__(self, number: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.timeout = timeout
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.lock_wait = 0.0
+
+    def run(self):
+        queued_at = time.time()
+        with _run_lock:
+            self.lock_wait += time.time() - queued_at
+            self.at.run(timeout=self.timeout)
+
+    def state(self, key: str, default=None):
+        try:
+            return self.at.session_state[key]
+        except KeyError:
+            return default
+
+def _widget(widgets, label: str, last: bool = False):
+    matches = [widget for widget in widgets if widget.label == label]
+    if not matches:
+        raise LookupError(f"No widget labelled {label!r}")
+    return matches[-1] if last else matches[0]
+
+def wait_for_jobs(session: Session):
+    """Rerun the session until its queued and running jobs have finished.
+
+    AppTest does not drive the app's status fragments, so poll at the same interval.
+    """
+    deadline = time.time() + session.timeout
+    while session.state("jobs"):
+        if time.time() > deadline:
+            raise TimeoutError("Jobs did not finish in time")
+        time.sleep(float(os.environ['WORKER_POLL_INTERVAL']))
+        session.run()
+
+def run_research(session: Session):
+    at = session.at
+    _widget(at.text_input, "Enter your business name:").input(f"Loadtest Business {session.number}")
+    session.run()
+    _widget(at.text_input, "Enter your industry:").input("Specialty coffee")
+    _widget(at.text_input, "Describe your target market:").input("Urban millennials")
+    _widget(at.button, "Analyze Market & Create Strategy").click()
+    session.run()
+    wait_for_jobs(session)
+
+def run_content(session: Session):
+    at = session.at
+    _widget(at.text_area, "Describe your business idea:").input("Neighbourhood specialty coffee shop")
+    _widget(at.text_input, "Describe your target audience:").input("Remote workers")
+    _widget(at.text_input, "Describe your brand style:").input("Warm and minimal")
+    _widget(at.button, "Generate Assets").click()
+    session.run()
+    wait_for_jobs(session)
+
+def run_video(session: Session):
+    if not session.state("generated_image_url"):
+        raise RuntimeError("No generated image to animate; run the content action first")
+    _widget(session.at.button, "Generate Video from Image").click()
+    session.run()
+    wait_for_jobs(session)
+
+def run_influencer(session: Session):
+    at = session.at
+    _widget(at.text_area, "Describe your brand style:").input("Bright streetwear")
+    _widget(at.text_input, "Describe your target audience:", last=True).input("Gen Z skaters")
+    _widget(at.button, "Generate Influencer").click()
+    session.run()
+    wait_for_jobs(session)
+
+ACTION_RUNNERS = {
+    'research': run_research,
+    'content': run_content,
+    'video': run_video,
+    'influencer': run_influencer
+}
+
+def _failed_session(number: int, error: str) -> Dict:
+    return {
+        'session': number,
+        'error': error,
+        'actions': [],
+        'generated_content_items': 0,
+        'generated_content_bytes': 0
+    }
+
+def run_session(number: int, scenario: List[str], timeout: float, start_barrier: threading.Barrier) -> Dict:
+    """Load the app, wait for every other session, then run the scenario.
+
+    Failures are recorded in the returned result rather than raised, and every
+    session reaches the barrier, so one failed session cannot stop the others.
+    """
+    load_error = None
+    try:
+        session = Session(number, timeout)
+        session.run()
+    except Exception as e:
+        load_error = f"{type(e).__name__}: {e}"
+    finally:
+        try:
+            start_barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+    if load_error:
+        return _failed_session(number, f"App failed to load: {load_error}")
+
+    actions = []
+    for action in scenario:
+        started_at = time.time()
+        lock_wait = session.lock_wait
+        error = None
+        try:
+            ACTION_RUNNERS[action](session)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        at = session.at
+        if error is None and (at.exception or at.error):
+            error = "; ".join([str(item.value) for item in at.error] + [str(item.value) for item in at.exception])
+        actions.append({
+            'action': action,
+            'seconds': round(time.time() - started_at, 3),
+            'lock_wait_seconds': round(session.lock_wait - lock_wait, 3),
+            'ok': error is None,
+            'error': error
+        })
+
+    content = session.state("generated_content", []) or []
+    return {
+        'session': number,
+        'error': None,
+        'actions': actions,
+        'generated_content_items': len(content),
+        'generated_content_bytes': len(json.dumps(list(content), default=str))
+    }
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(APP_PATH), stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_report(args, sessions: List[Dict], wall_seconds: float, calls: Dict[str, int],
+                 memory: Dict) -> Dict:
+    latency = {}
+    for action in args.scenario:
+        results = [a for s in sessions for a in s['actions'] if a['action'] == action]
+        seconds = [a['seconds'] for a in results if a['ok']]
+        lock_waits = [a['lock_wait_seconds'] for a in results if a['ok']]
+        latency[action] = {
+            'runs': len(results),
+            'failures': sum(1 for a in results if not a['ok']),
+            'p50_seconds': _percentile(seconds, 0.5),
+            'p90_seconds': _percentile(seconds, 0.9),
+            'p99_seconds': _percentile(seconds, 0.99),
+            'max_seconds': round(max(seconds), 3) if seconds else None,
+            # Harness overhead from serialised AppTest runs, included in the figures above
+            'p50_lock_wait_seconds': _percentile(lock_waits, 0.5),
+            'p90_lock_wait_seconds': _percentile(lock_waits, 0.9)
+        }
+
+    completed = sum(1 for s in sessions for a in s['actions'] if a['ok'])
+    loaded = [s for s in sessions if not s['error']]
+    content_bytes = [s['generated_content_bytes'] for s in loaded] or [0]
+    session_errors = {}
+    for session in sessions:
+        if session['error']:
+            session_errors[session['error']] = session_errors.get(session['error'], 0) + 1
+    upstream_totals = {}
+    for endpoint, count in calls.items():
+        upstream = endpoint.split(" ", 1)[0]
+        upstream_totals[upstream] = upstream_totals.get(upstream, 0) + count
+
+    report = {
+        'revision': _git_revision(),
+        'config': {
+            'sessions': args.sessions,
+            'scenario': args.scenario,
+            'delays': {**DEFAULT_DELAYS, **args.delays},
+            'poll_interval': args.poll_interval
+        },
+        'summary': {
+            'wall_seconds': round(wall_seconds, 3),
+            'failed_sessions': sum(1 for s in sessions if s['error']),
+            'completed_actions': completed,
+            'failed_actions': sum(1 for s in sessions for a in s['actions'] if not a['ok']),
+            'throughput_actions_per_minute': round(completed / wall_seconds * 60, 2) if wall_seconds else None
+        },
+        'latency': latency,
+        'session_state': {
+            'mean_generated_content_items': round(sum(s['generated_content_items'] for s in loaded) / max(len(loaded), 1), 2),
+            'mean_generated_content_bytes': round(sum(content_bytes) / len(content_bytes)),
+            'max_generated_content_bytes': max(content_bytes)
+        },
+        'memory': memory,
+        'session_errors': session_errors,
+        'upstream_calls': {
+            'total': upstream_totals,
+            'per_session': {k: round(v / args.sessions, 2) for k, v in upstream_totals.items()},
+            'by_endpoint': calls
+        }
+    }
+    if args.details:
+        report['sessions'] = sessions
+    return report
+
+def parse_args(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Drive concurrent headless sessions of the Streamlit app against local API stand-ins")
+    parser.add_argument("--sessions", type=int, default=20, help="Number of simultaneous sessions")
+    parser.add_argument("--scenario", default="research,content,video",
+                        help=f"Comma separated actions per session, from: {', '.join(ACTIONS)}")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds allowed per action")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="WORKER_POLL_INTERVAL for the app")
+    for upstream, delay in DEFAULT_DELAYS.items():
+        parser.add_argument(f"--{upstream}-delay", type=float, default=delay,
+                            help=f"Simulated {upstream} latency in seconds")
+    parser.add_argument("--output", default="loadtest_report.json", help="Where to write the JSON report")
+    parser.add_argument("--details", action="store_true", help="Include per-session results in the report")
+    args = parser.parse_args(argv)
+
+    args.scenario = [action.strip() for action in args.scenario.split(",") if action.strip()]
+    unknown = [action for action in args.scenario if action not in ACTIONS]
+    if unknown:
+        parser.error(f"Unknown actions: {', '.join(unknown)}")
+    args.delays = {upstream: getattr(args, f"{upstream}_delay") for upstream in DEFAULT_DELAYS}
+    return args
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process, or None where getrusage is unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 2)
+
+def main(argv: List[str] = None):
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    stub = StubServer(args.delays).start()
+    work_dir = tempfile.mkdtemp(prefix="maria-loadtest-")
+    configure_environment(stub, work_dir, args.poll_interval)
+
+    # Sessions load the app first; the clock starts when the last one is ready
+    started = {}
+
+    def start_clock():
+        started['at'] = time.time()
+        started['peak_rss_mb'] = _peak_rss_mb()
+
+    start_barrier = threading.Barrier(args.sessions, action=start_clock)
+    launched_at = time.time()
+    sessions = []
+    try:
+        with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+            futures = [
+                executor.submit(run_session, i, args.scenario, args.timeout, start_barrier)
+                for i in range(args.sessions)
+            ]
+            for i, future in enumerate(futures):
+                try:
+                    sessions.append(future.result())
+                except Exception as e:
+                    sessions.append(_failed_session(i, f"{type(e).__name__}: {e}"))
+    finally:
+        stub.stop()
+    wall_seconds = time.time() - started.get('at', launched_at)
+
+    memory = {
+        'peak_rss_after_load_mb': started.get('peak_rss_mb'),
+        'peak_rss_mb': _peak_rss_mb()
+    }
+    report = build_report(args, sessions, wall_seconds, stub.calls(), memory)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    print(json.dumps({k: report[k] for k in ['summary', 'latency', 'session_state', 'memory', 'session_errors']}, indent=2))
+    print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
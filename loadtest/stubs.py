@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import uuid
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+# Simulated upstream latency in seconds
+DEFAULT_DELAYS = {'openai': 0.5, 'leonardo': 0.2, 'runway': 0.2, 'serper': 0.2}
+
+# Polls before a Leonardo generation or Runway task reports completion
+LEONARDO_POLLS = 2
+RUNWAY_POLLS = 2
+
+def _final_answer(messages: list) -> str:
+    """Pick a canned answer in the format the current task asks for"""
+    text = " ".join(str(message.get('content', '')) for message in messages)
+    if "VIDEO_PROMPT" in text:
+        answer = 'VIDEO_PROMPT: "Slow dolly in on the subject, soft golden hour light, gentle lens flare, shallow depth of field"'
+    elif "NEGATIVE" in text:
+        answer = ('PROMPT: "8k resolution, professional photograph, smiling barista handing a latte to a customer, '
+                  'warm morning light, 85mm lens, shallow depth of field" NEGATIVE: "blurry, distorted hands, watermark"')
+    else:
+        answer = ("## Report\n1. Market Size & Growth: steady growth.\n2. Competitive Analysis: fragmented.\n"
+                  "3. Target Audience: digitally native.\n4. Market Trends: short-form video, authenticity.")
+    return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+def _wants_tool_call(body: Dict) -> bool:
+    """Ask for one search per task, before any tool result is in the conversation"""
+    messages = body.get('messages', [])
+    if any(message.get('role') == "tool" or "Observation:" in str(message.get('content', ''))
+           for message in messages):
+        return False
+    if body.get('tools'):
+        return True
+    return "Action Input" in " ".join(str(message.get('content', '')) for message in messages)
+
+class StubState:
+    """Call counters and task progress shared by the stand-in endpoints"""
+
+    def __init__(self, delays: Dict[str, float]):
+        self.delays = {**DEFAULT_DELAYS, **delays}
+        self.calls = Counter()
+        self.polls = Counter()
+        self.lock = threading.Lock()
+        self.video_path = _make_video()
+
+    def count(self, upstream: str, endpoint: str):
+        with self.lock:
+            self.calls[f"{upstream} {endpoint}"] += 1
+
+    def poll(self, task_id: str) -> int:
+        with self.lock:
+            self.polls[task_id] += 1
+            return self.polls[task_id]
+
+def _make_video() -> str:
+    """Write a short test clip for Runway outputs, if OpenCV is available"""
+    try:
+        import cv2
+        import numpy as np
+    except ImportError:
+        return None
+    path = os.path.join(tempfile.mkdtemp(prefix="maria-stub-"), "video.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 24, (640, 384))
+    for i in range(48):
+        frame = np.full((384, 640, 3), (40, 90 + i * 3, 160), np.uint8)
+        cv2.circle(frame, (i * 12, 192), 40, (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _body(self) -> Dict:
+            length = int(self.headers.get("content-length") or 0)
+            if not length:
+                return {}
+            try:
+                return json.loads(self.rfile.read(length))
+            except ValueError:
+                return {}
+
+        def _json(self, payload: Dict, status: int = 200):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _bytes(self, data: bytes, content_type: str):
+            self.send_response(200)
+            self.send_header("content-type", content_type)
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _base(self) -> str:
+            return f"http://{self.headers['host']}"
+
+        def _delay(self, upstream: str):
+            time.sleep(state.delays.get(upstream, 0))
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path.startswith("/leonardo/generations/"):
+                state.count("leonardo", "GET /generations/{id}")
+                self._delay("leonardo")
+                generation_id = path.rsplit("/", 1)[1]
+                done = state.poll(generation_id) >= LEONARDO_POLLS
+                self._json({'generations_by_pk': {
+                    'status': "COMPLETE" if done else "PENDING",
+                    'modelId': "stub-model",
+                    'generated_images': [{'url': f"{self._base()}/assets/{generation_id}.jpg", 'seed': 42}] if done else []
+                }})
+            elif path.startswith("/runway/v1/tasks/"):
+                state.count("runway", "GET /v1/tasks/{id}")
+                self._delay("runway")
+                task_id = path.rsplit("/", 1)[1]
+                polls = state.poll(task_id)
+                done = polls >= RUNWAY_POLLS
+                self._json({
+                    'id': task_id,
+                    'createdAt': "2024-01-01T00:00:00Z",
+                    'status': "SUCCEEDED" if done else "RUNNING",
+                    'progress': 1.0 if done else polls / RUNWAY_POLLS,
+                    'output': [f"{self._base()}/assets/{task_id}.mp4"] if done else None
+                })
+            elif path.startswith("/assets/"):
+                state.count("assets", "GET /assets")
+                if path.endswith(".mp4") and state.video_path:
+                    with open(state.video_path, "rb") as f:
+                        self._bytes(f.read(), "video/mp4")
+                else:
+                    self._bytes(b"\xff\xd8\xff\xe0" + os.urandom(64 * 1024) + b"\xff\xd9", "image/jpeg")
+            else:
+                self._json({'error': f"Unknown stub path {path}"}, 404)
+
+        def do_POST(self):
+            path = self.path.split("?")[0]
+            body = self._body()
+            if path.endswith("/chat/completions"):
+                state.count("openai", "POST /chat/completions")
+                self._delay("openai")
+                self._json(self._chat_completion(body))
+            elif path.endswith("/images/generations"):
+                state.count("openai", "POST /images/generations")
+                self._delay("openai")
+                self._json({'created': int(time.time()),
+                            'data': [{'url': f"{self._base()}/assets/{uuid.uuid4().hex}.jpg"}]})
+            elif path == "/leonardo/generations":
+                state.count("leonardo", "POST /generations")
+                self._delay("leonardo")
+                self._json({'sdGenerationJob': {'generationId': uuid.uuid4().hex}})
+            elif path == "/runway/v1/image_to_video":
+                state.count("runway", "POST /v1/image_to_video")
+                self._delay("runway")
+                self._json({'id': uuid.uuid4().hex})
+            elif path.startswith("/serper/"):
+                state.count("serper", f"POST /{path.rsplit('/', 1)[1]}")
+                self._delay("serper")
+                query = body.get('q', "")
+                self._json({'searchParameters': {'q': query}, 'organic': [
+                    {'title': f"{query} result {i}", 'link': f"https://example.com/{i}",
+                     'snippet': f"Stub insight {i} about {query}.", 'position': i}
+                    for i in range(1, 4)
+                ]})
+            else:
+                self._json({'error': f"Unknown stub path {path}"}, 404)
+
+        def _chat_completion(self, body: Dict) -> Dict:
+            message = {'role': "assistant", 'content': _final_answer(body.get('messages', []))}
+            finish_reason = "stop"
+            if _wants_tool_call(body):
+                if body.get('tools'):
+                    tool = body['tools'][0]['function']['name']
+                    message = {'role': "assistant", 'content': None, 'tool_calls': [{
+                        'id': f"call_{uuid.uuid4().hex[:12]}",
+                        'type': "function",
+                        'function': {'name': tool, 'arguments': json.dumps({'search_query': "market trends"})}
+                    }]}
+                    finish_reason = "tool_calls"
+                else:
+                    message['content'] = ('Thought: I should search for current data\n'
+                                          'Action: Search the internet with Serper\n'
+                                          'Action Input: {"search_query": "market trends"}')
+            return {
+                'id': f"chatcmpl-{uuid.uuid4().hex}",
+                'object': "chat.completion",
+                'created': int(time.time()),
+                'model': body.get('model', "gpt-4"),
+                'choices': [{'index': 0, 'message': message, 'finish_reason': finish_reason}],
+                'usage': {'prompt_tokens': 100, 'completion_tokens': 50, 'total_tokens': 150}
+            }
+
+    return Handler
+
+class StubServer:
+    """Runs all stand-ins on one local port in a background thread"""
+
+    def __init__(self, delays: Dict[str, float] = None, port: int = 0):
+        self.state = StubState(delays or {})
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(self.state))
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables that point the app and its SDKs at the stand-ins"""
+        return {
+            'OPENAI_BASE_URL': f"{self.base_url}/openai/v1",
+            'OPENAI_API_BASE': f"{self.base_url}/openai/v1",
+            'RUNWAYML_BASE_URL': f"{self.base_url}/runway",
+            'LEONARDO_BASE_URL': f"{self.base_url}/leonardo",
+            'SERPER_BASE_URL': f"{self.base_url}/serper"
+        }
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def calls(self) -> Dict[str, int]:
+        with self.state.lock:
+            return dict(sorted(self.state.calls.items()))
\ No newline at end of file
@@ -4,104 +4,212 @@ import time
 import logging
 from openai import OpenAI
 from runwayml import RunwayML
-import requests
-from crewai import Crew, Process
 import os
+import copy
+import uuid
+import base64
+import mimetypes
+from typing import Optional
 
 # Import local modules
-from config import DEFAULT_SESSION_STATE
+from config import (
+    DEFAULT_SESSION_STATE, WORKER_POLL_INTERVAL, OPENAI_IMAGE_MODEL, LEONARDO_BASE_URL
+)
 from services.leonardo import LeonardoAI
-from tasks.content_tasks import create_content_generation_tasks, create_content_crew
-from tasks.research_tasks import create_research_tasks, create_research_crew
+from services.openai_images import OpenAIImages
+from services.hedged_images import HedgedImageGenerator, latency_stats
+from services.model_router import get_model_router
+from services.research_cache import get_research_cache, get_usage_history
+from services.prewarm import get_prewarm_scheduler
+from services.worker_pool import get_worker_pool, SUCCEEDED, FAILED, CANCELLED
+from services.video_ingest import ingest_video
+from services.export import export_bundle, export_url, cache_asset
+from services.prompt_compiler import compile_leonardo_prompt, compile_video_prompt
+from agents.content_agents import get_leonardo_expert
+from agents.video_agents import get_video_prompt_agent
+from tasks.content_tasks import create_content_generation_tasks, create_content_crew, create_content_research_task
+from tasks.research_tasks import create_research_tasks, create_research_crew, create_segment_research_task
 from tasks.video_tasks import create_video_prompt_task, create_video_crew
+from tasks.prompt_tasks import create_prompt_repair_task, create_prompt_repair_crew
 logging.getLogger('opentelemetry').setLevel(logging.ERROR)
 
 # Initialize clients
 client = OpenAI()
 client_runway = RunwayML()
-content_leonardo_client = LeonardoAI(os.environ["LEONARDO_CONTENT_API_KEY"])
-leonardo_client = LeonardoAI(os.environ["LEONARDO_API_KEY"])
+content_leonardo_client = LeonardoAI(
+    os.environ["LEONARDO_CONTENT_API_KEY"], name="leonardo_content", base_url=LEONARDO_BASE_URL
+)
+leonardo_client = LeonardoAI(
+    os.environ["LEONARDO_API_KEY"], name="leonardo_influencer", base_url=LEONARDO_BASE_URL
+)
+openai_images = OpenAIImages(client, model=OPENAI_IMAGE_MODEL)
+content_image_generator = HedgedImageGenerator(content_leonardo_client, openai_images)
+influencer_image_generator = HedgedImageGenerator(leonardo_client, openai_images)
+worker_pool = get_worker_pool()
+model_router = get_model_router()
+research_cache = get_research_cache()
+usage_history = get_usage_history()
+prewarm_scheduler = get_prewarm_scheduler()
 
 def initialize_session_state():
     """Initialize Streamlit session state variables"""
     for key, value in DEFAULT_SESSION_STATE.items():
         if key not in st.session_state:
-            st.session_state[key] = value
+            st.session_state[key] = copy.deepcopy(value)
+    
+    if 'user_id' not in st.session_state:
+        st.session_state.user_id = uuid.uuid4().hex
+
+def submit_job(key: str, label: str, fn, *args):
+    """Queue work on the shared worker pool for this session"""
+    job_id = st.session_state.jobs.get(key)
+    job = worker_pool.get_job(job_id) if job_id else None
+    if job is not None and not job.is_done():
+        st.warning(f"{job.label} is already in progress. Cancel it to start a new one.")
+        return
+    
+    response = worker_pool.submit(st.session_state.user_id, label, fn, *args)
+    if "error" in response:
+        st.error(response["error"])
+    else:
+        st.session_state.jobs[key] = response["job_id"]
+
+def poll_job(key: str):
+    """Return a job's result once it succeeds, showing its status until then"""
+    job_id = st.session_state.jobs.get(key)
+    if not job_id:
+        return None
+    
+    job = worker_pool.get_job(job_id)
+    if job is None:
+        del st.session_state.jobs[key]
+        st.warning("This request expired before its results were collected. Please try again.")
+        return None
+    
+    if job.is_done():
+        del st.session_state.jobs[key]
+        worker_pool.forget(job_id)
+        if job.status == FAILED:
+            st.error(f"An error occurred: {job.error}")
+        elif job.status == CANCELLED:
+            st.info(f"{job.label} was cancelled.")
+        return job.result if job.status == SUCCEEDED else None
+    
+    show_job_status(key)
+    return None
+
+@st.fragment(run_every=WORKER_POLL_INTERVAL)
+def show_job_status(key: str):
+    """Refresh a job's queue position or progress without rerunning the whole app"""
+    job_id = st.session_state.jobs.get(key)
+    job = worker_pool.get_job(job_id) if job_id else None
+    if job is None or job.is_done():
+        # Rerun the app once so poll_job collects the result
+        st.rerun()
+    
+    position = worker_pool.queue_position(job_id)
+    if position:
+        st.info(f"{job.label}: waiting in queue (position {position}). It will start automatically.")
+    else:
+        st.progress(job.progress, text=f"{job.label}... {int(job.progress * 100)}%")
+    
+    if st.button("Cancel", key=f"cancel_{key}"):
+        worker_pool.cancel(job_id)
 
 def handle_content_generation(business_idea: str, target_audience: str, brand_style: str):
     """Handle the content generation process"""
+    usage_history.record("content", [business_idea, target_audience, brand_style])
+    submit_job(
+        "content",
+        "Generating marketing content",
+        run_content_generation,
+        business_idea, target_audience, brand_style
+    )
+
+def run_content_generation(job, business_idea: str, target_audience: str, brand_style: str) -> dict:
+    """Run the content crew and Leonardo.ai generation on a worker thread"""
     # Create tasks and crew
     tasks = create_content_generation_tasks(business_idea, target_audience, brand_style)
     crew = create_content_crew(tasks)
     
     # Run the crew
-    result = crew.kickoff()
+    result = model_router.kickoff(crew, "content")
+    job.progress = 0.7
+    if job.is_cancelled():
+        return {}
     
     # Extract the prompt
     leonardo_prompt = extract_leonardo_prompt(result)
+    if not leonardo_prompt:
+        return {"error": "Could not build a valid Leonardo.ai prompt from the crew output. Please try again."}
     
-    if leonardo_prompt:
-        generate_and_display_content(leonardo_prompt, business_idea)
+    prompt = leonardo_prompt['prompt']
+    response = content_image_generator.generate_marketing_image(
+        prompt,
+        negative_prompt=leonardo_prompt['negative_prompt']
+    )
+    response['prompt'] = prompt
+    response['negative_prompt'] = leonardo_prompt['negative_prompt']
+    return response
 
-def extract_leonardo_prompt(result) -> str:
-    """Extract Leonardo.ai prompt from crew result"""
-    leonardo_prompt = ""
-    if hasattr(result, 'raw'):
-        for task_output in result.tasks_output:
-            if 'PROMPT:' in task_output.raw:
-                leonardo_prompt = task_output.raw.split('PROMPT:')[1].split('NEGATIVE:')[0].strip().strip('"')
-                break
-        
-        if not leonardo_prompt:
-            leonardo_prompt = result.tasks_output[-1].raw.strip()
-            leonardo_prompt = f"8k resolution, award winning photography, professional photograph, {leonardo_prompt}"
+def extract_leonardo_prompt(result) -> Optional[dict]:
+    """Extract and compile the Leonardo.ai prompt from crew result"""
+    if not hasattr(result, 'raw'):
+        return None
     
-    return leonardo_prompt
+    # The prompt task runs last, so prefer the most recent output with a PROMPT section
+    for task_output in reversed(result.tasks_output):
+        if 'PROMPT' in task_output.raw:
+            return compile_leonardo_prompt(task_output.raw, repair=repair_leonardo_prompt)
+    
+    return compile_leonardo_prompt(result.tasks_output[-1].raw, repair=repair_leonardo_prompt)
 
-def generate_and_display_content(prompt: str, business_idea: str):
-    """Generate and display content using Leonardo.ai"""
+def repair_prompt(draft: str, section: str, max_chars: int, get_agent) -> str:
+    """Ask an agent for a targeted re-edit of a prompt that failed pre-flight checks"""
     try:
-        with st.spinner("Generating marketing image with Leonardo.ai..."):
-            prompt_text = clean_prompt(prompt)
-            response = content_leonardo_client.generate_marketing_image(prompt_text)
-            
-            if "url" in response:
-                handle_successful_generation(response, prompt)
-            else:
-                st.error(f"Error generating image: {response.get('error', 'Unknown error')}")
-                if 'details' in response:
-                    st.write("Error details:", response['details'])
-
+        task = create_prompt_repair_task(draft, section, max_chars, get_agent)
+        return model_router.kickoff(create_prompt_repair_crew(task), "prompt_repair").raw
     except Exception as e:
-        st.error(f"Error generating image: {str(e)}")
-        st.write("Debug - Exception details:", str(e))
+        logging.warning("Prompt repair failed: %s", e)
+        return ""
 
-def clean_prompt(prompt: str) -> str:
-    """Clean and format the prompt for Leonardo.ai"""
-    if "PROMPT:" in prompt:
-        prompt_text = prompt.split("PROMPT:")[1].split("NEGATIVE:")[0].strip().strip('"')
-    else:
-        prompt_text = prompt.strip()
-    
-    if not any(term in prompt_text.lower() for term in ["8k", "award winning", "professional"]):
-        prompt_text = f"8k resolution, award winning photography, professional photograph, {prompt_text}"
-    
-    if len(prompt_text) > 500:
-        prompt_text = prompt_text[:500]
+def repair_leonardo_prompt(draft: str, max_chars: int) -> str:
+    """Re-edit a Leonardo.ai prompt with the Leonardo expert"""
+    return repair_prompt(draft, "PROMPT", max_chars, get_leonardo_expert)
+
+def repair_video_prompt(draft: str, max_chars: int) -> str:
+    """Re-edit a Runway video prompt with the video motion expert"""
+    return repair_prompt(draft, "VIDEO_PROMPT", max_chars, get_video_prompt_agent)
+
+def display_content_result():
+    """Display the result of the content generation job once it finishes"""
+    response = poll_job("content")
+    if not response:
+        return
     
-    return prompt_text
+    if "url" in response:
+        handle_successful_generation(response, response['prompt'])
+    else:
+        st.error(f"Error generating image: {response.get('error', 'Unknown error')}")
+        if 'details' in response:
+            st.write("Error details:", response['details'])
 
 def handle_successful_generation(response: dict, prompt: str):
     """Handle successful image generation"""
     image_url = response["url"]
     if image_url:
         st.session_state.generated_image_url = image_url
+        st.session_state.generated_image_path = response.get('local_path')
         st.session_state.dalle_prompt = prompt
         st.session_state.generated_content.append({
             'type': 'image',
             'url': image_url,
+            'local_path': response.get('local_path'),
             'description': "Marketing Content",
             'prompt': prompt,
+            'negative_prompt': response.get('negative_prompt'),
+            'seed': response.get('seed'),
+            'model_id': response.get('modelId'),
             'created_at': datetime.now().isoformat()
         })
         
@@ -110,7 +218,7 @@ def handle_successful_generation(response: dict, prompt: str):
 def display_generated_content(image_url: str, response: dict, prompt: str):
     """Display generated content and debug information"""
     st.success("Your Instagram marketing content has been generated!")
-    st.image(image_url, caption="Generated Marketing Content")
+    st.image(response.get('local_path') or image_url, caption="Generated Marketing Content")
     st.markdown(f"[Download Image]({image_url})")
     
     with st.expander("Debug Info"):
@@ -131,122 +239,153 @@ def handle_video_generation(business_idea: str):
     st.subheader("Video Generation")
     
     if st.button("Generate Video from Image"):
-        task = create_video_prompt_task(
-            business_idea, 
-            st.session_state.dalle_prompt
+        submit_job(
+            "video",
+            "Generating video",
+            run_video_generation,
+            business_idea,
+            st.session_state.dalle_prompt,
+            st.session_state.generated_image_url,
+            st.session_state.generated_image_path
         )
-        crew = create_video_crew(task)
-        generate_video(crew)
+    
+    display_video_result()
 
-def generate_video(crew: Crew):
-    """Generate video using RunwayML"""
-    try:
-        prompt_result = crew.kickoff()
-        video_prompt = extract_video_prompt(prompt_result)
-        
-        if video_prompt:
-            st.info(f"Generated video prompt: {video_prompt}")
-            process_video_generation(video_prompt)
-    except Exception as e:
-        st.error(f"Error generating video: {str(e)}")
+def run_video_generation(job, business_idea: str, image_prompt: str, image_url: str,
+                         image_path: Optional[str] = None) -> dict:
+    """Generate the video prompt and the RunwayML video on a worker thread"""
+    task = create_video_prompt_task(business_idea, image_prompt)
+    crew = create_video_crew(task)
+    video_prompt = extract_video_prompt(model_router.kickoff(crew, "video_prompt"))
+    
+    if not video_prompt:
+        return {"error": "Could not build a valid video prompt from the crew output. Please try again."}
+    if job.is_cancelled():
+        return {}
+    
+    response = generate_runway_video(job, video_prompt, runway_prompt_image(image_url, image_path))
+    if "url" in response and not job.is_cancelled():
+        job.progress = 0.9
+        # Keep the remote URL usable even if local renditions cannot be built
+        try:
+            asset = ingest_video(response['url'])
+        except Exception as e:
+            asset = {"error": str(e)}
+        if "error" in asset:
+            logging.warning("Video ingest failed: %s", asset['error'])
+        else:
+            response['asset'] = asset
+    return response
+
+def runway_prompt_image(image_url: str, image_path: Optional[str]) -> str:
+    """Send a locally cached image as a data URI, since its remote URL may have expired"""
+    # Runway accepts data URIs up to 5 MB once base64 encoded
+    if not image_path or not os.path.exists(image_path) or os.path.getsize(image_path) > 3.5 * 1024 * 1024:
+        return image_url
+    mime_type = mimetypes.guess_type(image_path)[0] or "image/png"
+    with open(image_path, "rb") as image_file:
+        return f"data:{mime_type};base64,{base64.b64encode(image_file.read()).decode()}"
 
 def extract_video_prompt(result) -> str:
-    """Extract video prompt from crew result"""
+    """Extract and compile the video prompt from crew result"""
     if hasattr(result, 'raw'):
-        if 'VIDEO_PROMPT:' in result.raw:
-            return result.raw.split('VIDEO_PROMPT:')[1].strip().strip('"')
+        return compile_video_prompt(result.raw, repair=repair_video_prompt)
     return ""
 
-def process_video_generation(video_prompt: str):
-    """Process video generation with RunwayML"""
-    with st.spinner("Generating video..."):
-        if len(video_prompt) > 520:
-            st.error("Video prompt is too long. Must be under 520 characters.")
-            return
-        
-        generate_runway_video(video_prompt)
-
-def generate_runway_video(prompt: str):
+def generate_runway_video(job, prompt: str, image_url: str) -> dict:
     """Generate video using RunwayML"""
     max_retries = 3
-    success = False
     
     for attempt in range(max_retries):
         try:
             response = client_runway.image_to_video.create(
                 model='gen3a_turbo',
-                prompt_image=st.session_state.generated_image_url,
+                prompt_image=image_url,
                 prompt_text=prompt
             )
-            success = True
-            handle_runway_response(response, prompt)
             break
         except Exception as e:
             if attempt == max_retries - 1:
-                st.error(f"Failed after {max_retries} attempts: {str(e)}")
-            else:
-                time.sleep(5 * (attempt + 1))
-
-def handle_runway_response(response, prompt: str):
-    """Handle RunwayML video generation response"""
-    if hasattr(response, 'id'):
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        monitor_video_generation(response.id, progress_bar, status_text, prompt)
+                return {"error": f"Failed after {max_retries} attempts: {str(e)}", "prompt": prompt}
+            time.sleep(5 * (attempt + 1))
+    
+    if not hasattr(response, 'id'):
+        return {"error": "Invalid response from RunwayML", "prompt": prompt}
+    
+    return monitor_video_generation(job, response.id, prompt)
 
-def monitor_video_generation(task_id: str, progress_bar, status_text, prompt: str):
+def monitor_video_generation(job, task_id: str, prompt: str) -> dict:
     """Monitor video generation progress"""
     max_attempts = 60
-    attempts = 0
     
-    while attempts < max_attempts:
+    for _ in range(max_attempts):
+        if job.is_cancelled():
+            cancel_runway_task(task_id)
+            return {}
+        
         try:
             status_response = client_runway.tasks.retrieve(id=task_id)
             if status_response.status == "SUCCEEDED":
-                handle_successful_video(status_response.output[0], prompt)
-                break
+                return {'url': status_response.output[0], 'prompt': prompt}
             elif status_response.status == "FAILED":
-                handle_failed_video(status_response)
-                break
+                return {
+                    'error': f"Video generation failed: {status_response.failure}",
+                    'failure_code': status_response.failure_code,
+                    'prompt': prompt
+                }
             elif status_response.status in ["PENDING", "RUNNING"]:
-                update_progress(status_response, progress_bar, status_text)
+                job.progress = getattr(status_response, 'progress', 0) or 0
         except Exception as e:
-            st.error(f"Error checking status: {str(e)}")
+            logging.warning("Error checking video status: %s", e)
         
         time.sleep(5)
-        attempts += 1
     
-    if attempts >= max_attempts:
-        st.error("Video generation timed out. Please try again.")
+    return {"error": "Video generation timed out. Please try again.", "prompt": prompt}
 
-def handle_successful_video(video_url: str, prompt: str):
+def cancel_runway_task(task_id: str):
+    """Cancel a RunwayML task whose job was cancelled"""
+    try:
+        client_runway.tasks.delete(id=task_id)
+    except Exception as e:
+        logging.warning("Error cancelling video task: %s", e)
+
+def display_video_result():
+    """Display the result of the video generation job once it finishes"""
+    response = poll_job("video")
+    if not response:
+        return
+    
+    if response.get('prompt'):
+        st.info(f"Generated video prompt: {response['prompt']}")
+    
+    if "url" in response:
+        handle_successful_video(response['url'], response['prompt'], response.get('asset', {}))
+    else:
+        handle_failed_video(response)
+
+def handle_successful_video(video_url: str, prompt: str, asset: dict):
     """Handle successful video generation"""
     st.session_state.generated_content.append({
         'type': 'video',
         'url': video_url,
         'description': "Marketing Video",
         'prompt': prompt,
-        'created_at': datetime.now().isoformat()
+        'created_at': datetime.now().isoformat(),
+        **asset
     })
     
     st.session_state.video_generated = True
     st.success("Video generated successfully!")
-    st.video(video_url)
+    # Play the H.264 preview when one was written; the full-size source would be loaded into memory per session
+    st.video(asset.get('preview_path') or video_url)
     st.markdown(f"[Download Video]({video_url})")
 
-def handle_failed_video(status_response):
+def handle_failed_video(response: dict):
     """Handle failed video generation"""
-    st.error(f"Video generation failed: {status_response.failure}")
-    if status_response.failure_code == "INTERNAL.BAD_OUTPUT.CODE01":
+    st.error(response.get('error', 'Unknown error'))
+    if response.get('failure_code') == "INTERNAL.BAD_OUTPUT.CODE01":
         st.error("The input image or prompt may be causing issues. Try a different prompt or image.")
 
-def update_progress(status_response, progress_bar, status_text):
-    """Update video generation progress"""
-    progress = getattr(status_response, 'progress', 0)
-    progress_bar.progress(progress)
-    status_text.text(f"Processing video... {int(progress * 100)}%")
-
-
 def show_ai_influencer_tab():
     """Display AI influencer tab"""
     st.title("AI Influencer Generator")
@@ -258,44 +397,85 @@ def show_ai_influencer_tab():
         submit_button = st.form_submit_button("Generate Influencer")
         
     if submit_button and brand_style and target_audience:
+        submit_job(
+            "influencer",
+            "Creating your AI influencer",
+            run_influencer_generation,
+            brand_style, target_audience, num_photos
+        )
+    
+    response = poll_job("influencer")
+    if response:
+        display_influencer_result(response)
+
+def run_influencer_generation(job, brand_style: str, target_audience: str, num_photos: int) -> dict:
+    """Run the influencer crew and generate its photos on a worker thread"""
+    tasks = create_content_generation_tasks(brand_style, target_audience, brand_style)
+    crew = create_content_crew(tasks)
+    result = model_router.kickoff(crew, "influencer")
+    job.progress = 0.4
+    if job.is_cancelled():
+        return {}
+    
+    compiled_prompt = extract_leonardo_prompt(result)
+    if not compiled_prompt:
+        return {"error": "Could not build a valid Leonardo.ai prompt from the crew output. Please try again."}
+    
+    photos = []
+    for i in range(num_photos):
+        if job.is_cancelled():
+            break
+        response = influencer_image_generator.generate_image(
+            compiled_prompt['prompt'],
+            negative_prompt=compiled_prompt['negative_prompt']
+        )
+        job.progress = 0.4 + 0.6 * (i + 1) / num_photos
+        if not response.get("url"):
+            photos.append({'error': response.get('error', 'Unknown error')})
+            continue
         try:
-            with st.spinner("Creating your AI influencer..."):
-                tasks = create_content_generation_tasks(brand_style, target_audience, brand_style)
-                crew = create_content_crew(tasks)
-                result = crew.kickoff()
-                
-                prompts = result.tasks_output[1].raw.split("PROMPT:")
-                st.subheader("Generated Images")
-                cols = st.columns(3)
-                
-                for i in range(num_photos):
-                    with cols[i % 3]:
-                        with st.spinner(f"Generating photo {i+1}..."):
-                            response = leonardo_client.generate_image(prompts[0])
-                            if "url" in response:
-                                image_url = response["url"]
-                                if image_url:
-                                    st.image(image_url, caption=f"Photo {i+1}")
-                                    try:
-                                        image_response = requests.get(image_url)
-                                        if image_response.status_code == 200:
-                                            st.download_button(
-                                                f"Download Photo {i+1}",
-                                                data=image_response.content,
-                                                file_name=f"influencer_photo_{i+1}.jpg",
-                                                mime="image/jpeg"
-                                            )
-                                            st.session_state.generated_content.append({
-                                                'type': 'image',
-                                                'url': image_url,
-                                                'description': f"AI Influencer Photo {i+1}",
-                                                'prompt': prompts[0],
-                                                'created_at': datetime.now().isoformat()
-                                            })
-                                    except Exception as e:
-                                        st.error(f"Error downloading image: {str(e)}")
+            response['local_path'] = response.get('local_path') or cache_asset(response['url'])
         except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
+            photos.append({'error': f"Error downloading image: {str(e)}"})
+            continue
+        photos.append(response)
+    
+    return {**compiled_prompt, 'photos': photos}
+
+def display_influencer_result(response: dict):
+    """Display the influencer photos once the job finishes"""
+    if "error" in response:
+        st.error(response['error'])
+        return
+    
+    st.subheader("Generated Images")
+    cols = st.columns(3)
+    
+    for i, photo in enumerate(response['photos']):
+        with cols[i % 3]:
+            if "error" in photo:
+                st.error(photo['error'])
+                continue
+            st.image(photo['local_path'], caption=f"Photo {i+1}")
+            with open(photo['local_path'], "rb") as image_file:
+                st.download_button(
+                    f"Download Photo {i+1}",
+                    data=image_file,
+                    file_name=f"influencer_photo_{i+1}.jpg",
+                    mime="image/jpeg"
+                )
+            st.session_state.generated_content.append({
+                'type': 'image',
+                'url': photo['url'],
+                'local_path': photo['local_path'],
+                'description': f"AI Influencer Photo {i+1}",
+                'prompt': response['prompt'],
+                'negative_prompt': response['negative_prompt'],
+                'seed': photo.get('seed'),
+                'model_id': photo.get('modelId'),
+                'created_at': datetime.now().isoformat()
+            })
+
 def show_content_generation_tab():
     """Display content generation tab"""
     st.title("Website Asset Generator")
@@ -308,7 +488,9 @@ def show_content_generation_tab():
     
     if submit_button and business_idea and target_audience:
         handle_content_generation(business_idea, target_audience, brand_style)
-        handle_video_generation(business_idea)
+    
+    display_content_result()
+    handle_video_generation(business_idea)
 
 def show_market_research_tab():
     """Display market research tab"""
@@ -324,20 +506,26 @@ def show_market_research_tab():
     
     if business_name and st.button("Analyze Market & Create Strategy"):
         handle_market_research(business_name, business_stage, industry, target_market)
+    
+    result = poll_job("research")
+    if result:
+        display_research_results(result)
 
 def handle_market_research(business_name: str, business_stage: str, industry: str, target_market: str):
     """Handle market research process"""
-    with st.spinner("Analyzing market and creating strategy..."):
-        try:
-            tasks = create_research_tasks(business_name, business_stage, industry, target_market)
-            crew = create_research_crew(tasks)
-            result = crew.kickoff()
-            
-            display_research_results(result)
-            
-        except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
-            st.write("Debug - Error details:", str(e))
+    usage_history.record("research", [industry, target_market])
+    submit_job(
+        "research",
+        "Analyzing market and creating strategy",
+        run_market_research,
+        business_name, business_stage, industry, target_market
+    )
+
+def run_market_research(job, business_name: str, business_stage: str, industry: str, target_market: str):
+    """Run the market research crew on a worker thread"""
+    tasks = create_research_tasks(business_name, business_stage, industry, target_market)
+    crew = create_research_crew(tasks)
+    return model_router.kickoff(crew, "market_research")
 
 def display_research_results(result):
     """Display market research results"""
@@ -370,6 +558,20 @@ def show_content_manager_tab():
         st.write("All session state keys:", st.session_state.keys())
         st.write("Content items:", st.session_state.generated_content)
     
+    with st.expander("Model Performance"):
+        report = model_router.report()
+        st.write("Task latency by model:")
+        st.dataframe(report['tasks'])
+        st.write("End-to-end crew time by model mix:")
+        st.dataframe(report['crews'])
+        st.write("Image provider latency and hedging:")
+        st.dataframe(latency_stats())
+    
+    with st.expander("Research Cache"):
+        st.write("Hit rate by cache (warm hits were served from pre-warmed entries):")
+        st.dataframe(research_cache.stats())
+        st.write("Pre-warm scheduler:", prewarm_scheduler.status())
+    
     display_content_grid()
 
 def display_content_grid():
@@ -395,20 +597,116 @@ def display_filtered_content(content_type: str):
         return
     
     filtered_content = filter_content(content_type)
+    display_export_section(filtered_content)
     display_content_items(filtered_content)
 
+def display_export_section(items: list):
+    """Export the selected items as a ZIP bundle with a manifest"""
+    with st.expander("Bulk Export"):
+        labels = [f"{i + 1}. {item['description']} ({item['created_at'][:16]})" for i, item in enumerate(items)]
+        selected = st.multiselect("Items to export", labels, default=labels)
+        
+        if st.button("Export as ZIP", disabled=not selected):
+            selected_items = [dict(items[labels.index(label)]) for label in selected]
+            submit_job("export", "Exporting content", run_export, selected_items)
+        
+        result = poll_job("export")
+        if result:
+            st.session_state.last_export = result
+        
+        export = st.session_state.last_export
+        if export:
+            st.success(f"Exported {export['items']} items ({export['size_bytes'] / 1024 / 1024:.1f} MB)")
+            display_export_download(export)
+            if export['errors']:
+                st.warning(f"{len(export['errors'])} items could not be downloaded; see manifest.json")
+
+def display_export_download(export: dict):
+    """Link to the bundle on the static file server, or fall back to a download button"""
+    if not os.path.exists(export['path']):
+        st.info("This export has expired. Please export again.")
+        return
+    
+    url = export_url(export['path'])
+    if url:
+        # Static serving sends ZIPs as text/plain, so the download attribute forces a file save
+        st.markdown(
+            f'<a href="{url}" download="{export["file_name"]}">Download {export["file_name"]}</a>',
+            unsafe_allow_html=True
+        )
+    else:
+        with open(export['path'], "rb") as bundle:
+            st.download_button(
+                f"Download {export['file_name']}",
+                data=bundle,
+                file_name=export['file_name'],
+                mime="application/zip"
+            )
+
+def run_export(job, items: list) -> dict:
+    """Build the export bundle on a worker thread"""
+    return export_bundle(items, job)
+
+def display_content_items(items: list):
+    """Display content items, using lightweight renditions for videos"""
+    cols = st.columns(3)
+    for i, item in enumerate(reversed(items)):
+        with cols[i % 3]:
+            if item['type'] == 'video':
+                display_video_item(item)
+            else:
+                st.image(item.get('local_path') or item['url'], caption=item['description'])
+            st.caption(item['created_at'])
+            with st.expander("Prompt"):
+                st.write(item['prompt'])
+
+def display_video_item(item: dict):
+    """Display a video as its animated thumbnail, loading the preview on demand"""
+    if not item.get('thumbnail_path'):
+        st.video(item['url'])
+        st.caption(item['description'])
+        return
+    
+    st.image(item['thumbnail_path'], caption=item['description'])
+    st.caption(f"{item['width']}x{item['height']}, {item['duration']:.1f}s")
+    if st.toggle("Play preview", key=f"preview_{item['asset_id']}"):
+        st.video(item.get('preview_path') or item['url'])
+    st.markdown(f"[Download Video]({item['url']})")
+
 def filter_content(content_type: str):
     """Filter content based on type"""
     if content_type == "All":
         return st.session_state.generated_content
+    if content_type == "AI Influencer":
+        return [
+            item for item in st.session_state.generated_content
+            if item['description'].startswith("AI Influencer")
+        ]
+    # Filter labels are plural ("Images") while item types are singular ("image")
     return [
         item for item in st.session_state.generated_content 
-        if item['type'].lower() == content_type.lower()
+        if item['type'].lower() == content_type.lower().rstrip('s')
     ]
 
+def warm_segment_research(key: list) -> str:
+    """Pre-warm research for an industry and target market"""
+    industry, target_market = key
+    crew = create_research_crew([create_segment_research_task(industry, target_market)])
+    return model_router.kickoff(crew, "prewarm").raw
+
+def warm_content_research(key: list) -> str:
+    """Pre-warm trend research for a content generation request"""
+    business_idea, target_audience, brand_style = key
+    crew = create_content_crew([create_content_research_task(business_idea, target_audience, brand_style)])
+    return model_router.kickoff(crew, "prewarm").raw
+
 def main():
     initialize_session_state()
     
+    prewarm_scheduler.register("research", warm_segment_research)
+    prewarm_scheduler.register("content", warm_content_research)
+    prewarm_scheduler.start()
+    
     tab1, tab2, tab3, tab4 = st.tabs([
         "Content Generation",
         "Market Research & Strategy",
@@ -0,0 +1,24 @@
+from typing import Any
+from crewai_tools import SerperDevTool
+
+from services.research_cache import get_research_cache
+
+class CachedSerperDevTool(SerperDevTool):
+    """Serper search that reuses recent results for the same query"""
+
+    cache_max_age: int = 86400
+
+    def _run(self, **kwargs: Any) -> Any:
+        query = kwargs.get("search_query") or kwargs.get("query")
+        if not query:
+            return super()._run(**kwargs)
+
+        key = [query, kwargs.get("search_type", self.search_type), self.n_results]
+        cache = get_research_cache()
+        cached = cache.get("serper", key, max_age=self.cache_max_age)
+        if cached is not None:
+            return cached
+
+        results = super()._run(**kwargs)
+        cache.set("serper", key, results)
+        return results
\ No newline at end of file
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+import zipfile
+import requests
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from config import MEDIA_DIR, STATIC_DIR, EXPORT_DIR, EXPORT_TTL
+
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_FIELDS = ['type', 'description', 'prompt', 'negative_prompt', 'seed', 'model_id',
+                   'created_at', 'url', 'duration', 'width', 'height']
+
+def cache_asset(url: str, timeout: int = 60) -> str:
+    """Stream a remote asset into the local media cache and return its path"""
+    extension = os.path.splitext(urlparse(url).path)[1] or ".bin"
+    name = hashlib.sha256(url.encode()).hexdigest()[:32] + extension
+    cache_dir = os.path.join(MEDIA_DIR, "cache")
+    path = os.path.join(cache_dir, name)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    partial_path = f"{path}.{uuid.uuid4().hex}.part"
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(partial_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    return path
+
+def local_copy(item: Dict) -> str:
+    """Return a local file for a content item, downloading it only if needed"""
+    local_path = item.get('local_path')
+    if local_path and os.path.exists(local_path):
+        return local_path
+    return cache_asset(item['url'])
+
+def export_bundle(items: List[Dict], job=None) -> Dict:
+    """Write content items and a manifest into a ZIP on disk, one asset at a time"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    remove_expired_exports()
+
+    file_name = f"maria_export_{time.strftime('%Y%m%d_%H%M%S')}.zip"
+    # Static files are public, so the stored name is an unguessable token
+    path = os.path.join(EXPORT_DIR, f"{uuid.uuid4().hex}.zip")
+    manifest = []
+    errors = []
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as bundle:
+        for i, item in enumerate(items):
+            if job is not None:
+                if job.is_cancelled():
+                    break
+                job.progress = i / max(len(items), 1)
+
+            entry = {field: item[field] for field in MANIFEST_FIELDS if item.get(field) is not None}
+            try:
+                source = local_copy(item)
+                arcname = f"{i + 1:03d}_{item['type']}{os.path.splitext(source)[1]}"
+                # Media is already compressed, so store it and copy in chunks
+                with open(source, "rb") as src, bundle.open(arcname, "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                entry['file'] = arcname
+            except (requests.exceptions.RequestException, OSError) as e:
+                logging.warning("Could not export %s: %s", item.get('url'), e)
+                entry['error'] = str(e)
+                errors.append(item.get('url'))
+            manifest.append(entry)
+
+        bundle.writestr(
+            "manifest.json",
+            json.dumps({'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'items': manifest}, indent=2),
+            compress_type=zipfile.ZIP_DEFLATED
+        )
+
+    if job is not None and job.is_cancelled():
+        os.remove(path)
+        return {}
+
+    return {
+        'path': path,
+        'file_name': file_name,
+        'size_bytes': os.path.getsize(path),
+        'items': len(manifest),
+        'errors': errors
+    }
+
+def export_url(path: str) -> Optional[str]:
+    """Return the static file URL for an export, or None if it is outside the static directory"""
+    relative = os.path.relpath(os.path.abspath(path), STATIC_DIR)
+    if relative.startswith(os.pardir):
+        return None
+    return "app/static/" + relative.replace(os.sep, "/")
+
+def remove_expired_exports():
+    cutoff = time.time() - EXPORT_TTL
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        # Another session may remove the same file between the two calls
+        try:
+            if name.endswith(".zip") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
\ No newline at end of file
@@ -0,0 +1,130 @@
+import threading
+import time
+import logging
+import requests
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List
+
+from config import (
+    IMAGE_HEDGE_PERCENTILE, IMAGE_HEDGE_DEFAULT_SECONDS,
+    IMAGE_HEDGE_MIN_SAMPLES, IMAGE_HEDGE_WINDOW
+)
+from services.export import cache_asset
+
+# Latency samples are shared by every session, keyed by provider name
+_latencies = defaultdict(lambda: deque(maxlen=IMAGE_HEDGE_WINDOW))
+_outcomes = defaultdict(lambda: {'requests': 0, 'wins': 0, 'errors': 0, 'hedged': 0, 'fallbacks': 0})
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="maria-image")
+
+def _record(provider: str, seconds: float, ok: bool):
+    with _lock:
+        _outcomes[provider]['requests'] += 1
+        if ok:
+            _latencies[provider].append(seconds)
+        else:
+            _outcomes[provider]['errors'] += 1
+
+def _count(provider: str, key: str):
+    with _lock:
+        _outcomes[provider][key] += 1
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def hedge_threshold(provider: str) -> float:
+    """Seconds to wait on a provider before hedging, from its recent latency"""
+    with _lock:
+        samples = list(_latencies[provider])
+    if len(samples) < IMAGE_HEDGE_MIN_SAMPLES:
+        return IMAGE_HEDGE_DEFAULT_SECONDS
+    return _percentile(samples, IMAGE_HEDGE_PERCENTILE)
+
+def latency_stats() -> List[Dict]:
+    """Per-provider latency and hedging outcomes for reporting"""
+    with _lock:
+        providers = sorted(set(_latencies) | set(_outcomes))
+        stats = []
+        for provider in providers:
+            samples = sorted(_latencies[provider])
+            stats.append({
+                'provider': provider,
+                **_outcomes[provider],
+                'p50_seconds': round(_percentile(samples, 0.5), 2) if samples else None,
+                'p90_seconds': round(_percentile(samples, 0.9), 2) if samples else None
+            })
+    return stats
+
+class HedgedImageGenerator:
+    """Image generation that hedges a slow primary provider with a secondary one.
+
+    The primary request starts immediately. If it has not finished by the
+    primary's recent latency percentile, or fails before then, the same prompt
+    is sent to the secondary and whichever succeeds first is returned. The
+    loser is told to stop through its cancel event, or ignored if it cannot be
+    cancelled.
+    """
+
+    def __init__(self, primary, secondary):
+        self.primary = primary
+        self.secondary = secondary
+
+    def _timed(self, provider, prompt: str, negative_prompt: str, cancel_event: threading.Event) -> Dict:
+        started_at = time.time()
+        response = provider.generate_image(prompt, negative_prompt=negative_prompt, cancel_event=cancel_event)
+        # A cancelled loser was at least this slow; dropping the sample would bias the threshold down
+        _record(provider.name, time.time() - started_at, "url" in response or cancel_event.is_set())
+        response['provider'] = provider.name
+        return response
+
+    def _result(self, future, provider) -> Dict:
+        try:
+            return future.result()
+        except Exception as e:
+            logging.warning("%s image generation failed: %s", provider.name, e)
+            return {"error": str(e)}
+
+    def _keep_local_copy(self, response: Dict):
+        """Download a winning image whose URL will expire, outside the timed race"""
+        try:
+            response['local_path'] = cache_asset(response['url'])
+        except (requests.exceptions.RequestException, OSError) as e:
+            logging.warning("Could not cache image %s: %s", response['url'], e)
+
+    def generate_image(self, prompt: str, negative_prompt: str = "") -> Dict:
+        cancel_events = {self.primary.name: threading.Event(), self.secondary.name: threading.Event()}
+        futures = {
+            _executor.submit(self._timed, self.primary, prompt, negative_prompt,
+                             cancel_events[self.primary.name]): self.primary
+        }
+
+        done, _ = wait(futures, timeout=hedge_threshold(self.primary.name))
+        if not done or "url" not in self._result(next(iter(done)), self.primary):
+            logging.info("%s %s with %s", "Falling back from" if done else "Hedging",
+                         self.primary.name, self.secondary.name)
+            _count(self.primary.name, 'fallbacks' if done else 'hedged')
+            futures[_executor.submit(self._timed, self.secondary, prompt, negative_prompt,
+                                     cancel_events[self.secondary.name])] = self.secondary
+
+        pending = set(futures)
+        response = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                response = self._result(future, futures[future])
+                if "url" in response:
+                    winner = futures[future]
+                    _count(winner.name, 'wins')
+                    for name, event in cancel_events.items():
+                        if name != winner.name:
+                            event.set()
+                    if getattr(winner, 'expiring_urls', False):
+                        self._keep_local_copy(response)
+                    return response
+
+        # Every provider failed, so report the last error
+        return response
+
+    generate_marketing_image = generate_image
\ No newline at end of file
@@ -1,19 +1,22 @@
 import requests
 import time
-from typing import Dict
+import threading
+from typing import Dict, Optional
 
 class LeonardoAI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, name: str = "leonardo",
+                 base_url: str = "https://cloud.leonardo.ai/api/rest/v1"):
         self.api_key = api_key
-        self.base_url = "https://cloud.leonardo.ai/api/rest/v1"
+        self.name = name
+        self.base_url = base_url
         self.headers = {
             "accept": "application/json",
             "content-type": "application/json",
             "authorization": f"Bearer {self.api_key}"
         }
 
-    def _get_base_payload(self, prompt: str) -> Dict:
-        return {
+    def _get_base_payload(self, prompt: str, negative_prompt: str = "") -> Dict:
+        payload = {
             "prompt": prompt,
             "modelId": "aa77f04e-3eec-4034-9c07-d0f619684628",
             "width": 1024,
@@ -24,10 +27,14 @@ class LeonardoAI:
             "presetStyle": "CINEMATIC",
             "num_images": 1
         }
+        if negative_prompt:
+            payload["negative_prompt"] = negative_prompt
+        return payload
 
-    def generate_image(self, prompt: str) -> Dict:
+    def generate_image(self, prompt: str, negative_prompt: str = "",
+                       cancel_event: Optional[threading.Event] = None) -> Dict:
         try:
-            payload = self._get_base_payload(prompt)
+            payload = self._get_base_payload(prompt, negative_prompt)
             response = requests.post(
                 f"{self.base_url}/generations",
                 json=payload,
@@ -37,15 +44,18 @@ class LeonardoAI:
             
             if 'sdGenerationJob' in response.json():
                 generation_id = response.json()['sdGenerationJob']['generationId']
-                return self._wait_for_generation(generation_id)
+                return self._wait_for_generation(generation_id, cancel_event=cancel_event)
             
             return {"error": "Invalid response format"}
             
         except requests.exceptions.RequestException as e:
             return {"error": str(e)}
 
-    def _wait_for_generation(self, generation_id: str, max_attempts: int = 30) -> Dict:
+    def _wait_for_generation(self, generation_id: str, max_attempts: int = 30,
+                             cancel_event: Optional[threading.Event] = None) -> Dict:
         for _ in range(max_attempts):
+            if cancel_event is not None and cancel_event.is_set():
+                return {"error": "Generation cancelled"}
             try:
                 response = requests.get(
                     f"{self.base_url}/generations/{generation_id}",
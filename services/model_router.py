@@ -0,0 +1,167 @@
+import threading
+import time
+import logging
+from collections import defaultdict, deque
+from typing import Dict, List
+
+from config import (
+    MODEL_TIERS, MODEL_MAX_FAILURE_RATE, MODEL_MIN_SAMPLES,
+    MODEL_STATS_WINDOW, MODEL_STATS_MAX_AGE
+)
+
+TIER_ORDER = ["premium", "standard", "fast"]
+
+# Starting tier and latency SLO (seconds) per task. Critical tasks are never downgraded.
+TASK_POLICY = {
+    'market_research': {'tier': "premium", 'slo': 120, 'critical': True},
+    'social_media_strategy': {'tier': "premium", 'slo': 90, 'critical': True},
+    'business_plan': {'tier': "premium", 'slo': 90, 'critical': True},
+    'content_strategy': {'tier': "premium", 'slo': 60, 'critical': False},
+    'visual_concept': {'tier': "standard", 'slo': 45, 'critical': False},
+    'leonardo_prompt': {'tier': "standard", 'slo': 30, 'critical': False},
+    'video_prompt': {'tier': "fast", 'slo': 20, 'critical': False},
+    'runway_research': {'tier': "standard", 'slo': 60, 'critical': False},
+    'prompt_repair': {'tier': "fast", 'slo': 15, 'critical': False}
+}
+
+class Route:
+    """Model decision for one task, also used as the task's completion callback"""
+
+    def __init__(self, router, task_key: str, model: str, downgraded: bool):
+        self.router = router
+        self.task_key = task_key
+        self.model = model
+        self.downgraded = downgraded
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """Call listener(output) when the task completes"""
+        self.listeners.append(listener)
+
+    def __call__(self, output):
+        self.router.complete_task(self)
+        for listener in self.listeners:
+            listener(output)
+
+class ModelRouter:
+    """Assigns models to tasks and tracks latency and failure rate per task and model"""
+
+    def __init__(self, policy: Dict, tiers: Dict):
+        self.policy = policy
+        self.tiers = tiers
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._samples = defaultdict(lambda: deque(maxlen=MODEL_STATS_WINDOW))
+        self._crew_runs = defaultdict(lambda: deque(maxlen=MODEL_STATS_WINDOW))
+
+    def route(self, task_key: str) -> Route:
+        policy = self.policy[task_key]
+        tier_index = TIER_ORDER.index(policy['tier'])
+        downgraded = False
+
+        if not policy['critical']:
+            while (tier_index < len(TIER_ORDER) - 1
+                   and self._breaches_slo(task_key, self.tiers[TIER_ORDER[tier_index]], policy['slo'])):
+                tier_index += 1
+                downgraded = True
+
+        if downgraded:
+            logging.info("Routing %s to %s tier after SLO breach", task_key, TIER_ORDER[tier_index])
+        return Route(self, task_key, self.tiers[TIER_ORDER[tier_index]], downgraded)
+
+    def kickoff(self, crew, crew_name: str):
+        """Run a crew, timing each routed task and the crew end to end"""
+        routes = [task.callback for task in crew.tasks if isinstance(task.callback, Route)]
+        started_at = time.time()
+        self._local.mark = started_at
+        self._local.completed = 0
+        try:
+            result = crew.kickoff()
+        except Exception:
+            if self._local.completed < len(routes):
+                route = routes[self._local.completed]
+                self.record(route.task_key, route.model, time.time() - self._local.mark, ok=False)
+            raise
+        finally:
+            self._local.mark = None
+
+        with self._lock:
+            self._crew_runs[crew_name].append({
+                'seconds': time.time() - started_at,
+                'models': tuple(route.model for route in routes),
+                'downgraded': any(route.downgraded for route in routes)
+            })
+        return result
+
+    def complete_task(self, route: Route):
+        now = time.time()
+        mark = getattr(self._local, 'mark', None)
+        if mark is not None:
+            self.record(route.task_key, route.model, now - mark, ok=True)
+            self._local.mark = now
+            self._local.completed += 1
+
+    def record(self, task_key: str, model: str, seconds: float, ok: bool):
+        with self._lock:
+            self._samples[(task_key, model)].append((seconds, ok, time.time()))
+
+    def _breaches_slo(self, task_key: str, model: str, slo: float) -> bool:
+        # Only recent samples count, so a downgraded task returns to its tier once the breach ages out
+        cutoff = time.time() - MODEL_STATS_MAX_AGE
+        with self._lock:
+            samples = [(s, ok) for s, ok, at in self._samples[(task_key, model)] if at >= cutoff]
+        if len(samples) < MODEL_MIN_SAMPLES:
+            return False
+        failure_rate = sum(1 for _, ok in samples if not ok) / len(samples)
+        return _percentile([s for s, ok in samples if ok], 0.9) > slo or failure_rate > MODEL_MAX_FAILURE_RATE
+
+    def report(self) -> Dict:
+        """Summarize task latency per model and end-to-end crew time per model mix"""
+        with self._lock:
+            samples = {key: [(s, ok) for s, ok, _ in values] for key, values in self._samples.items()}
+            crew_runs = {name: list(runs) for name, runs in self._crew_runs.items()}
+
+        tasks = []
+        for (task_key, model), values in sorted(samples.items()):
+            latencies = [seconds for seconds, ok in values if ok]
+            tasks.append({
+                'task': task_key,
+                'model': model,
+                'calls': len(values),
+                'p50_seconds': round(_percentile(latencies, 0.5), 2),
+                'p90_seconds': round(_percentile(latencies, 0.9), 2),
+                'failure_rate': round(sum(1 for _, ok in values if not ok) / len(values), 3)
+            })
+
+        crews = []
+        for name, runs in sorted(crew_runs.items()):
+            by_mix = defaultdict(list)
+            for run in runs:
+                by_mix[(run['models'], run['downgraded'])].append(run['seconds'])
+            for (mix, downgraded), seconds in by_mix.items():
+                crews.append({
+                    'crew': name,
+                    'models': ", ".join(mix),
+                    'downgraded': downgraded,
+                    'runs': len(seconds),
+                    'mean_seconds': round(sum(seconds) / len(seconds), 2)
+                })
+
+        return {'tasks': tasks, 'crews': crews}
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+_router = None
+_router_lock = threading.Lock()
+
+def get_model_router() -> ModelRouter:
+    """Return the process-wide router so stats are shared by every session"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(TASK_POLICY, MODEL_TIERS)
+        return _router
\ No newline at end of file
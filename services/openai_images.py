@@ -0,0 +1,36 @@
+import threading
+from typing import Dict, Optional
+from openai import OpenAI, OpenAIError
+
+class OpenAIImages:
+    # Image URLs expire after about an hour, so winning images are copied locally
+    expiring_urls = True
+
+    def __init__(self, client: OpenAI, model: str = "dall-e-3", name: str = "openai"):
+        self.client = client
+        self.model = model
+        self.name = name
+
+    def generate_image(self, prompt: str, negative_prompt: str = "",
+                       cancel_event: Optional[threading.Event] = None) -> Dict:
+        # The Images API has no negative prompt, so fold it into the instruction.
+        # A single blocking request cannot be cancelled; a losing result is ignored.
+        if negative_prompt:
+            prompt = f"{prompt}. Avoid: {negative_prompt}"
+        try:
+            response = self.client.images.generate(
+                model=self.model,
+                prompt=prompt,
+                size="1024x1024",
+                n=1,
+                response_format="url"
+            )
+            return {
+                'url': response.data[0].url,
+                'seed': None,
+                'modelId': self.model
+            }
+        except OpenAIError as e:
+            return {"error": str(e)}
+
+    generate_marketing_image = generate_image
\ No newline at end of file
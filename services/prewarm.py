@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from config import (
+    RESEARCH_CACHE_DIR, PREWARM_ENABLED, PREWARM_SEGMENTS_FILE, PREWARM_TOP_RECENT, PREWARM_HISTORY_DAYS,
+    PREWARM_REFRESH_AGE, PREWARM_OFF_PEAK_HOURS, PREWARM_MAX_RUNS_PER_DAY, PREWARM_CHECK_INTERVAL
+)
+from services.research_cache import get_research_cache, get_usage_history, cache_source, normalize_key
+from services.worker_pool import get_worker_pool, FAILED
+
+# Worker pool user for warm runs, so they share the per-user limit rather than taking every slot
+PREWARM_USER = "prewarm"
+BUDGET_PATH = os.path.join(RESEARCH_CACHE_DIR, "prewarm_budget.json")
+
+# Cache namespace and configured-segment fields for each kind of warmable request
+KINDS = {
+    'research': {'namespace': "segment", 'fields': ["industry", "target_market"]},
+    'content': {'namespace': "content_research", 'fields': ["business_idea", "target_audience", "brand_style"]}
+}
+
+def parse_hours(hours: str) -> Tuple[int, int]:
+    start, end = hours.split("-")
+    return int(start), int(end)
+
+class PrewarmScheduler:
+    """Refreshes research for popular segments off-peak, within a daily run budget.
+
+    Warmers are registered per kind by the app and called as ``warmer(key)``
+    on the shared worker pool; they return the research text to cache. The
+    daily run count is saved next to the cache so restarts keep the budget.
+    """
+
+    def __init__(self):
+        self.cache = get_research_cache()
+        self.history = get_usage_history()
+        self.pool = get_worker_pool()
+        self.warmers = {}
+        self.refreshed = 0
+        self.skipped_fresh = 0
+        self.last_cycle = None
+        self.last_error = None
+        self._day, self.runs_today = self._load_budget()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def register(self, kind: str, warmer: Callable[[List[str]], str]):
+        self.warmers[kind] = warmer
+
+    def start(self):
+        with self._lock:
+            if not PREWARM_ENABLED or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._loop, name="maria-prewarm", daemon=True)
+            self._thread.start()
+
+    def _load_budget(self) -> Tuple[str, int]:
+        try:
+            with open(BUDGET_PATH) as f:
+                budget = json.load(f)
+            return budget['day'], int(budget['runs'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, 0
+
+    def _save_budget(self):
+        os.makedirs(os.path.dirname(BUDGET_PATH) or ".", exist_ok=True)
+        partial_path = f"{BUDGET_PATH}.part"
+        with open(partial_path, "w") as f:
+            json.dump({'day': self._day, 'runs': self.runs_today}, f)
+        os.replace(partial_path, BUDGET_PATH)
+
+    def is_off_peak(self, now: datetime = None) -> bool:
+        hour = (now or datetime.now()).hour
+        start, end = parse_hours(PREWARM_OFF_PEAK_HOURS)
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def targets(self) -> List[Tuple[str, List[str]]]:
+        """Configured segments first, then the most frequent recent inputs"""
+        targets = []
+        if os.path.exists(PREWARM_SEGMENTS_FILE):
+            try:
+                with open(PREWARM_SEGMENTS_FILE) as f:
+                    configured = json.load(f)
+                for kind, spec in KINDS.items():
+                    for segment in configured.get(kind, []):
+                        targets.append((kind, [segment.get(field, "") for field in spec['fields']]))
+            except (OSError, ValueError, AttributeError) as e:
+                logging.warning("Could not read %s: %s", PREWARM_SEGMENTS_FILE, e)
+
+        for kind in KINDS:
+            for key in self.history.most_frequent(kind, PREWARM_TOP_RECENT, PREWARM_HISTORY_DAYS * 86400):
+                targets.append((kind, key))
+
+        unique = []
+        seen = set()
+        for kind, key in targets:
+            marker = (kind, tuple(normalize_key(key)))
+            # A request without inputs is not a segment worth warming
+            if not any(marker[1]):
+                continue
+            if marker not in seen:
+                seen.add(marker)
+                unique.append((kind, key))
+        return unique
+
+    def run_cycle(self):
+        today = datetime.now().date().isoformat()
+        if self._day != today:
+            self._day = today
+            self.runs_today = 0
+            self._save_budget()
+
+        for kind, key in self.targets():
+            if self.runs_today >= PREWARM_MAX_RUNS_PER_DAY:
+                logging.info("Pre-warm budget of %s runs reached", PREWARM_MAX_RUNS_PER_DAY)
+                break
+            warmer = self.warmers.get(kind)
+            namespace = KINDS[kind]['namespace']
+            if warmer is None:
+                continue
+            if self.cache.get_entry(namespace, key, max_age=PREWARM_REFRESH_AGE) is not None:
+                self.skipped_fresh += 1
+                continue
+
+            response = self.pool.submit(PREWARM_USER, f"Pre-warming {kind} research", _warm, warmer, key)
+            if "error" in response:
+                # The pool is busy with interactive work; try again next cycle
+                logging.info("Pre-warm deferred: %s", response['error'])
+                break
+            self.runs_today += 1
+            self._save_budget()
+
+            job = self._wait(response['job_id'])
+            if job.status == FAILED:
+                logging.warning("Pre-warm of %s %s failed: %s", kind, key, job.error)
+                self.last_error = job.error
+            elif job.result:
+                self.cache.set(namespace, key, job.result, source="prewarm")
+                self.refreshed += 1
+        self.last_cycle = datetime.now().isoformat()
+
+    def _wait(self, job_id: str):
+        job = self.pool.get_job(job_id)
+        while not job.is_done():
+            time.sleep(1)
+        self.pool.forget(job_id)
+        return job
+
+    def _loop(self):
+        while True:
+            if self.is_off_peak():
+                self.run_cycle()
+            time.sleep(PREWARM_CHECK_INTERVAL)
+
+    def status(self) -> Dict:
+        return {
+            'enabled': PREWARM_ENABLED,
+            'off_peak_hours': PREWARM_OFF_PEAK_HOURS,
+            'runs_today': self.runs_today,
+            'daily_budget': PREWARM_MAX_RUNS_PER_DAY,
+            'refreshed': self.refreshed,
+            'skipped_fresh': self.skipped_fresh,
+            'last_cycle': self.last_cycle,
+            'last_error': self.last_error
+        }
+
+def _warm(job, warmer: Callable[[List[str]], str], key: List[str]) -> str:
+    with cache_source("prewarm"):
+        return warmer(key)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_prewarm_scheduler() -> PrewarmScheduler:
+    """Return the process-wide scheduler so only one pre-warm thread runs"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PrewarmScheduler()
+        return _scheduler
\ No newline at end of file
@@ -0,0 +1,114 @@
+import re
+from typing import Callable, Dict, List, Optional
+
+# Provider limits (characters)
+LEONARDO_PROMPT_LIMIT = 500
+LEONARDO_NEGATIVE_LIMIT = 500
+RUNWAY_PROMPT_LIMIT = 520
+
+QUALITY_PREFIX = "8k resolution, award winning photography, professional photograph"
+QUALITY_TERMS = ["8k", "award winning", "professional"]
+
+SECTION_PATTERN = re.compile(
+    r'(?<![A-Za-z_])\**(VIDEO_PROMPT|NEGATIVE(?:[ _]PROMPT)?|PROMPT)\**\s*:\s*\**(.*?)'
+    r'(?=(?<![A-Za-z_])\**(?:VIDEO_PROMPT|NEGATIVE(?:[ _]PROMPT)?|PROMPT)\**\s*:|\Z)',
+    re.DOTALL
+)
+
+# A repair callback receives the draft text and the character limit and
+# returns a re-edited draft in the same PROMPT/NEGATIVE/VIDEO_PROMPT format.
+RepairFn = Callable[[str, int], str]
+
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Parse PROMPT/NEGATIVE/VIDEO_PROMPT sections from agent output"""
+    sections = {}
+    for name, body in SECTION_PATTERN.findall(text or ""):
+        name = "NEGATIVE" if name.startswith("NEGATIVE") else name
+        body = " ".join(body.split()).strip('*"\'`,; ')
+        if body and name not in sections:
+            sections[name] = body
+    return sections
+
+
+def _split_clauses(text: str) -> List[str]:
+    """Split a prompt into comma separated clauses, dropping duplicates"""
+    clauses = []
+    seen = set()
+    for clause in text.split(","):
+        clause = clause.strip()
+        if clause and clause.lower() not in seen:
+            seen.add(clause.lower())
+            clauses.append(clause)
+    return clauses
+
+
+def trim_to_limit(text: str, limit: int) -> str:
+    """Trim a prompt to the limit on clause and word boundaries"""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+
+    kept = []
+    for clause in _split_clauses(text):
+        candidate = ", ".join(kept + [clause])
+        if len(candidate) > limit:
+            break
+        kept.append(clause)
+
+    if kept:
+        return ", ".join(kept)
+
+    # The first clause alone is over the limit, so cut it at a word boundary
+    words = []
+    for word in text.split():
+        if len(" ".join(words + [word])) > limit:
+            break
+        words.append(word)
+    # A single word longer than the limit can only be cut mid-word
+    return " ".join(words).rstrip(",;:") or text[:limit]
+
+
+def _add_quality_prefix(prompt: str) -> str:
+    if not any(term in prompt.lower() for term in QUALITY_TERMS):
+        return f"{QUALITY_PREFIX}, {prompt}"
+    return prompt
+
+
+def compile_leonardo_prompt(text: str, repair: Optional[RepairFn] = None) -> Optional[Dict]:
+    """Compile agent output into a Leonardo.ai prompt and negative prompt.
+
+    Returns None when no PROMPT section can be recovered, so the generation
+    is rejected before it is submitted.
+    """
+    sections = parse_sections(text)
+    needs_repair = (
+        "PROMPT" not in sections
+        or len(_add_quality_prefix(sections["PROMPT"])) > LEONARDO_PROMPT_LIMIT
+    )
+    if needs_repair and repair:
+        # Leave room for the quality prefix unless the draft already carries quality terms
+        limit = LEONARDO_PROMPT_LIMIT
+        if _add_quality_prefix(sections.get("PROMPT", "")) != sections.get("PROMPT", ""):
+            limit -= len(QUALITY_PREFIX) + 2
+        repaired = parse_sections(repair(text, limit))
+        if "PROMPT" in repaired:
+            repaired.setdefault("NEGATIVE", sections.get("NEGATIVE", ""))
+            sections = repaired
+
+    if "PROMPT" not in sections:
+        return None
+
+    return {
+        'prompt': trim_to_limit(_add_quality_prefix(sections["PROMPT"]), LEONARDO_PROMPT_LIMIT),
+        'negative_prompt': trim_to_limit(sections.get("NEGATIVE", ""), LEONARDO_NEGATIVE_LIMIT)
+    }
+
+
+def compile_video_prompt(text: str, repair: Optional[RepairFn] = None) -> str:
+    """Compile agent output into a Runway prompt within the provider limit"""
+    prompt = parse_sections(text).get("VIDEO_PROMPT", "")
+    if (not prompt or len(prompt) > RUNWAY_PROMPT_LIMIT) and repair:
+        prompt = parse_sections(repair(text, RUNWAY_PROMPT_LIMIT)).get("VIDEO_PROMPT", prompt)
+
+    return trim_to_limit(prompt, RUNWAY_PROMPT_LIMIT) if prompt else ""
\ No newline at end of file
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+_source = threading.local()
+
+@contextmanager
+def cache_source(source: str):
+    """Tag cache writes made by this thread, e.g. by the pre-warmer"""
+    previous = getattr(_source, 'value', None)
+    _source.value = source
+    try:
+        yield
+    finally:
+        _source.value = previous
+
+def normalize_key(parts: List[str]) -> List[str]:
+    return [" ".join(str(part).lower().split()) for part in parts]
+
+class ResearchCache:
+    """Disk-backed TTL cache for research output and search lookups"""
+
+    def __init__(self, directory: str, ttl: int):
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {'lookups': 0, 'hits': 0, 'warm_hits': 0})
+
+    def _path(self, namespace: str, parts: List[str]) -> str:
+        digest = hashlib.sha256(json.dumps(normalize_key(parts)).encode()).hexdigest()[:32]
+        return os.path.join(self.directory, namespace, f"{digest}.json")
+
+    def get_entry(self, namespace: str, parts: List[str], max_age: Optional[int] = None) -> Optional[Dict]:
+        """Return the cached entry without counting a lookup"""
+        path = self._path(namespace, parts)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry['created_at'] > (self.ttl if max_age is None else max_age):
+            return None
+        return entry
+
+    def get(self, namespace: str, parts: List[str], max_age: Optional[int] = None):
+        entry = self.get_entry(namespace, parts, max_age)
+        with self._lock:
+            stats = self._stats[namespace]
+            stats['lookups'] += 1
+            if entry is not None:
+                stats['hits'] += 1
+                if entry['source'] == "prewarm":
+                    stats['warm_hits'] += 1
+        return entry['value'] if entry else None
+
+    def set(self, namespace: str, parts: List[str], value, source: Optional[str] = None):
+        path = self._path(namespace, parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial_path = f"{path}.{threading.get_ident()}.part"
+        with open(partial_path, "w") as f:
+            json.dump({
+                'key': normalize_key(parts),
+                'value': value,
+                'source': source or getattr(_source, 'value', None) or "interactive",
+                'created_at': time.time()
+            }, f)
+        os.replace(partial_path, path)
+
+    def stats(self) -> List[Dict]:
+        """Hit rate per namespace, split out for entries written by the pre-warmer"""
+        with self._lock:
+            return [
+                {
+                    'cache': namespace,
+                    **values,
+                    'hit_rate': round(values['hits'] / values['lookups'], 3) if values['lookups'] else None,
+                    'warm_hit_rate': round(values['warm_hits'] / values['lookups'], 3) if values['lookups'] else None
+                }
+                for namespace, values in sorted(self._stats.items())
+            ]
+
+class UsageHistory:
+    """Append-only log of interactive request inputs, compacted to ``max_age`` seconds daily"""
+
+    def __init__(self, path: str, max_age: int):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._compacted_at = 0
+
+    def record(self, kind: str, parts: List[str]):
+        if not any(normalize_key(parts)):
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        line = json.dumps({'kind': kind, 'key': normalize_key(parts), 'at': time.time()})
+        with self._lock:
+            if time.time() - self._compacted_at > 86400:
+                self._compact()
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+    def _entries(self):
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except OSError:
+            return
+
+    def _compact(self):
+        """Rewrite the log without entries older than max_age. Caller holds the lock."""
+        self._compacted_at = time.time()
+        cutoff = time.time() - self.max_age
+        partial_path = f"{self.path}.{threading.get_ident()}.part"
+        with open(partial_path, "w") as f:
+            for entry in self._entries():
+                if entry.get('at', 0) >= cutoff:
+                    f.write(json.dumps(entry) + "\n")
+        os.replace(partial_path, self.path)
+
+    def most_frequent(self, kind: str, limit: int, since_seconds: int) -> List[List[str]]:
+        cutoff = time.time() - since_seconds
+        counts = Counter()
+        with self._lock:
+            for entry in self._entries():
+                if entry.get('kind') == kind and entry.get('at', 0) >= cutoff:
+                    counts[tuple(entry['key'])] += 1
+        return [list(key) for key, _ in counts.most_common(limit)]
+
+_cache = None
+_history = None
+_init_lock = threading.Lock()
+
+def get_research_cache() -> ResearchCache:
+    global _cache
+    with _init_lock:
+        if _cache is None:
+            # Imported lazily because config builds the cached search tool from this module
+            from config import RESEARCH_CACHE_DIR, RESEARCH_CACHE_TTL
+            _cache = ResearchCache(RESEARCH_CACHE_DIR, RESEARCH_CACHE_TTL)
+        return _cache
+
+def get_usage_history() -> UsageHistory:
+    global _history
+    with _init_lock:
+        if _history is None:
+            from config import USAGE_HISTORY_PATH, PREWARM_HISTORY_DAYS
+            _history = UsageHistory(USAGE_HISTORY_PATH, PREWARM_HISTORY_DAYS * 86400)
+        return _history
\ No newline at end of file
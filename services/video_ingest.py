@@ -0,0 +1,178 @@
+import os
+import uuid
+import shutil
+import logging
+import requests
+import cv2
+from PIL import Image
+from typing import Dict, List
+
+from config import MEDIA_DIR
+
+CHUNK_SIZE = 1024 * 1024
+PREVIEW_WIDTH = 480
+PREVIEW_FPS = 12
+THUMBNAIL_WIDTH = 320
+THUMBNAIL_FRAME_MS = 400
+MAX_KEYFRAMES = 8
+# Histogram correlation below this marks a scene change
+SCENE_CHANGE_THRESHOLD = 0.7
+
+def download_video(url: str, path: str, timeout: int = 60) -> int:
+    """Stream a remote video to disk in chunks and return the bytes written"""
+    written = 0
+    with requests.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    written += len(chunk)
+    return written
+
+def probe_video(path: str) -> Dict:
+    """Read duration, resolution and frame rate of a local video"""
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            return {"error": "Could not open video"}
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        return {
+            'width': int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': fps,
+            'frame_count': frame_count,
+            'duration': frame_count / fps if fps else 0
+        }
+    finally:
+        capture.release()
+
+def _resize(frame, width: int):
+    height, original_width = frame.shape[:2]
+    if original_width <= width:
+        return frame
+    new_height = int(height * width / original_width) // 2 * 2
+    return cv2.resize(frame, (width, new_height), interpolation=cv2.INTER_AREA)
+
+def _histogram(frame):
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    hist = cv2.calcHist([hsv], [0, 1], None, [50, 60], [0, 180, 0, 256])
+    return cv2.normalize(hist, hist)
+
+def _open_writer(path: str, fps: float, size) -> cv2.VideoWriter:
+    # Only H.264 plays in browsers. The PyPI OpenCV wheels cannot encode it, and their
+    # MPEG-4 Part 2 output would not play, so skip the preview and let callers use the source URL.
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"avc1"), fps, size)
+    if writer.isOpened():
+        return writer
+    writer.release()
+    return None
+
+def process_video(path: str, output_dir: str, fps: float, frame_count: int) -> Dict:
+    """Extract keyframes and write a preview rendition in a single decode pass"""
+    capture = cv2.VideoCapture(path)
+    preview_path = os.path.join(output_dir, "preview.mp4")
+    frame_step = max(1, round(fps / PREVIEW_FPS)) if fps else 1
+    thumbnail_step = max(1, frame_count // MAX_KEYFRAMES)
+    writer = None
+    writer_opened = False
+    keyframes: List[str] = []
+    thumbnail_frames = []
+    previous_hist = None
+    index = 0
+
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+
+            if index % frame_step == 0:
+                small = _resize(frame, PREVIEW_WIDTH)
+                if not writer_opened:
+                    writer_opened = True
+                    writer = _open_writer(preview_path, (fps or PREVIEW_FPS) / frame_step,
+                                          (small.shape[1], small.shape[0]))
+                if writer is not None:
+                    writer.write(small)
+
+                hist = _histogram(small)
+                is_scene_change = (
+                    previous_hist is None
+                    or cv2.compareHist(previous_hist, hist, cv2.HISTCMP_CORREL) < SCENE_CHANGE_THRESHOLD
+                )
+                if is_scene_change and len(keyframes) < MAX_KEYFRAMES:
+                    keyframe_path = os.path.join(output_dir, f"keyframe_{len(keyframes):02d}.jpg")
+                    cv2.imwrite(keyframe_path, small)
+                    keyframes.append(keyframe_path)
+                    previous_hist = hist
+
+            if index % thumbnail_step == 0 and len(thumbnail_frames) < MAX_KEYFRAMES:
+                thumbnail_frames.append(_resize(frame, THUMBNAIL_WIDTH))
+            index += 1
+    finally:
+        capture.release()
+        if writer is not None:
+            writer.release()
+
+    return {
+        'keyframes': keyframes,
+        'preview_path': preview_path if writer is not None else None,
+        'thumbnail_path': write_thumbnail(thumbnail_frames, output_dir)
+    }
+
+def write_thumbnail(frames: list, output_dir: str) -> str:
+    """Write an animated GIF from the sampled frames"""
+    if not frames:
+        return None
+    images = [Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)) for frame in frames]
+    thumbnail_path = os.path.join(output_dir, "thumbnail.gif")
+    images[0].save(
+        thumbnail_path,
+        save_all=True,
+        append_images=images[1:],
+        duration=THUMBNAIL_FRAME_MS,
+        loop=0
+    )
+    return thumbnail_path
+
+def ingest_video(url: str) -> Dict:
+    """Download a generated video and build lightweight renditions for browsing"""
+    asset_id = uuid.uuid4().hex
+    output_dir = os.path.join(MEDIA_DIR, "videos", asset_id)
+    try:
+        asset = _ingest(url, asset_id, output_dir)
+    except Exception:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        raise
+    if "error" in asset:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return asset
+
+def _ingest(url: str, asset_id: str, output_dir: str) -> Dict:
+    os.makedirs(output_dir, exist_ok=True)
+    local_path = os.path.join(output_dir, "source.mp4")
+
+    try:
+        size = download_video(url, local_path)
+    except requests.exceptions.RequestException as e:
+        return {"error": str(e)}
+
+    metadata = probe_video(local_path)
+    if "error" in metadata:
+        return metadata
+
+    try:
+        renditions = process_video(local_path, output_dir, metadata['fps'], metadata['frame_count'])
+    except cv2.error as e:
+        logging.warning("Could not build renditions for %s: %s", local_path, e)
+        renditions = {'keyframes': [], 'preview_path': None, 'thumbnail_path': None}
+
+    return {
+        'asset_id': asset_id,
+        'local_path': local_path,
+        'size_bytes': size,
+        **metadata,
+        **renditions
+    }
\ No newline at end of file
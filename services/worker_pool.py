@@ -0,0 +1,169 @@
+import threading
+import time
+import uuid
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from config import WORKER_POOL_SIZE, WORKER_PER_USER_LIMIT, WORKER_QUEUE_LIMIT, WORKER_JOB_TTL
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+class Job:
+    def __init__(self, user_id: str, label: str, fn: Callable, args: tuple, kwargs: dict):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.label = label
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.progress = 0.0
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def is_done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED, CANCELLED)
+
+class WorkerPool:
+    """Shared job queue with global and per-user concurrency limits.
+
+    Jobs are started in submission order, except that a user who already has
+    ``per_user_limit`` jobs running is skipped so other sessions are not starved.
+    Job functions are called as ``fn(job, *args, **kwargs)`` and should check
+    ``job.is_cancelled()`` between slow steps.
+    """
+
+    def __init__(self, max_workers: int, per_user_limit: int, max_queue: int, job_ttl: int):
+        self.max_workers = max_workers
+        self.per_user_limit = per_user_limit
+        self.max_queue = max_queue
+        self.job_ttl = job_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="maria-worker")
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._jobs = {}
+        self._running_by_user = {}
+
+    def submit(self, user_id: str, label: str, fn: Callable, *args, **kwargs) -> Dict:
+        with self._lock:
+            self._prune()
+            if len(self._pending) >= self.max_queue:
+                return {"error": "The server is busy. Please try again in a few minutes."}
+            # A user may have one job waiting on top of the ones running
+            if self._active_for_user(user_id) > self.per_user_limit:
+                return {"error": "You already have the maximum number of requests in progress."}
+
+            job = Job(user_id, label, fn, args, kwargs)
+            self._jobs[job.id] = job
+            self._pending.append(job)
+            self._dispatch()
+            return {"job_id": job.id}
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def queue_position(self, job_id: str) -> int:
+        """Return the 1-based position of a pending job, or 0 if it is not queued"""
+        with self._lock:
+            for position, job in enumerate(self._pending, start=1):
+                if job.id == job_id:
+                    return position
+        return 0
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_done():
+                return False
+            job.cancel_event.set()
+            if job.status == PENDING:
+                self._pending.remove(job)
+                self._finish(job, CANCELLED)
+            return True
+
+    def forget(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.is_done():
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'running': sum(self._running_by_user.values()),
+                'max_workers': self.max_workers
+            }
+
+    def _active_for_user(self, user_id: str) -> int:
+        queued = sum(1 for job in self._pending if job.user_id == user_id)
+        return queued + self._running_by_user.get(user_id, 0)
+
+    def _dispatch(self):
+        """Start pending jobs while worker slots are free. Caller holds the lock."""
+        while sum(self._running_by_user.values()) < self.max_workers:
+            job = next(
+                (job for job in self._pending
+                 if self._running_by_user.get(job.user_id, 0) < self.per_user_limit),
+                None
+            )
+            if job is None:
+                return
+            self._pending.remove(job)
+            job.status = RUNNING
+            self._running_by_user[job.user_id] = self._running_by_user.get(job.user_id, 0) + 1
+            self._executor.submit(self._run, job)
+
+    def _run(self, job: Job):
+        status = SUCCEEDED
+        try:
+            job.result = job.fn(job, *job.args, **job.kwargs)
+            if job.is_cancelled():
+                status = CANCELLED
+        except Exception as e:
+            logging.exception("Job %s (%s) failed", job.id, job.label)
+            job.error = str(e)
+            status = FAILED
+        finally:
+            with self._lock:
+                self._running_by_user[job.user_id] -= 1
+                if not self._running_by_user[job.user_id]:
+                    del self._running_by_user[job.user_id]
+                self._finish(job, status)
+                self._dispatch()
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        job.fn = job.args = job.kwargs = None
+
+    def _prune(self):
+        """Forget finished jobs nobody has collected. Caller holds the lock."""
+        cutoff = time.time() - self.job_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.is_done() and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide pool shared by every Streamlit session"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(WORKER_POOL_SIZE, WORKER_PER_USER_LIMIT, WORKER_QUEUE_LIMIT, WORKER_JOB_TTL)
+        return _pool
\ No newline at end of file
@@ -6,20 +6,16 @@ from agents.content_agents import (
     get_leonardo_expert
 )
 from agents.research_agents import get_market_researcher
+from services.model_router import get_model_router
+from services.research_cache import get_research_cache
 
-def create_content_generation_tasks(
-    business_idea: str,
-    target_audience: str,
-    brand_style: str
-) -> List[Task]:
-    """Create tasks for content generation"""
-    
-    market_researcher = get_market_researcher()
-    content_strategist = get_content_strategist()
-    visual_director = get_visual_director()
-    leonardo_expert = get_leonardo_expert()
+def create_content_research_task(business_idea: str, target_audience: str, brand_style: str) -> Task:
+    """Create the trend research task, caching its output for repeat requests"""
+    route = get_model_router().route("market_research")
+    key = [business_idea, target_audience, brand_style]
+    route.add_listener(lambda output: get_research_cache().set("content_research", key, output.raw))
     
-    research_task = Task(
+    return Task(
         description=f"""Research current marketing trends and successful campaigns for:
         Business: '{business_idea}'
         Target: '{target_audience}'
@@ -30,19 +26,49 @@ def create_content_generation_tasks(
         3. Study successful competitor campaigns
         4. Note specific imagery styles that resonate with the audience
         5. Research color schemes and visual elements that perform well""",
-        agent=market_researcher,
-        expected_output="A detailed market research report with trends and recommendations"
+        agent=get_market_researcher(route.model),
+        expected_output="A detailed market research report with trends and recommendations",
+        callback=route
     )
 
+def create_content_generation_tasks(
+    business_idea: str,
+    target_audience: str,
+    brand_style: str
+) -> List[Task]:
+    """Create tasks for content generation"""
+    
+    router = get_model_router()
+    strategy_route = router.route("content_strategy")
+    visual_route = router.route("visual_concept")
+    prompt_route = router.route("leonardo_prompt")
+    
+    content_strategist = get_content_strategist(strategy_route.model)
+    visual_director = get_visual_director(visual_route.model)
+    leonardo_expert = get_leonardo_expert(prompt_route.model)
+    
+    # Start from cached research when this request (or a pre-warmed one) has been seen recently
+    cached_research = get_research_cache().get("content_research", [business_idea, target_audience, brand_style])
+    research_tasks = []
+    research_context = ""
+    if cached_research:
+        research_context = f"""Market research:
+        {cached_research}
+        
+        """
+    else:
+        research_tasks = [create_content_research_task(business_idea, target_audience, brand_style)]
+
     strategy_task = Task(
-        description="""Using the market research, develop a content concept that:
+        description=f"""{research_context}Using the market research, develop a content concept that:
         1. Aligns with current trends
         2. Reflects brand values
         3. Appeals to target audience
         4. Has viral potential
         5. Can be executed well by AI""",
         agent=content_strategist,
-        expected_output="A comprehensive content strategy with visual concepts"
+        expected_output="A comprehensive content strategy with visual concepts",
+        callback=strategy_route
     )
 
     visual_task = Task(
@@ -53,7 +79,8 @@ def create_content_generation_tasks(
         4. Environment and prop specifics
         5. Color grading and post-processing style""",
         agent=visual_director,
-        expected_output="A detailed visual direction document"
+        expected_output="A detailed visual direction document",
+        callback=visual_route
     )
 
     prompt_task = Task(
@@ -63,20 +90,16 @@ def create_content_generation_tasks(
         PROMPT: "detailed prompt"
         NEGATIVE: "negative prompt" """,
         agent=leonardo_expert,
-        expected_output="A formatted Leonardo.ai prompt with main and negative prompts"
+        expected_output="A formatted Leonardo.ai prompt with main and negative prompts",
+        callback=prompt_route
     )
 
-    return [research_task, strategy_task, visual_task, prompt_task]
+    return research_tasks + [strategy_task, visual_task, prompt_task]
 
 def create_content_crew(tasks: List[Task]) -> Crew:
     """Create a crew for content generation"""
     return Crew(
-        agents=[
-            get_market_researcher(),
-            get_content_strategist(),
-            get_visual_director(),
-            get_leonardo_expert()
-        ],
+        agents=[task.agent for task in tasks],
         tasks=tasks,
         process=Process.sequential
     )
\ No newline at end of file
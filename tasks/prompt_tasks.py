@@ -0,0 +1,34 @@
+from crewai import Agent, Task, Crew, Process
+from typing import Callable
+from services.model_router import get_model_router
+
+def create_prompt_repair_task(draft: str, section: str, max_chars: int, get_agent: Callable[[str], Agent]) -> Task:
+    """Create a targeted re-edit task for a prompt that failed pre-flight checks"""
+    route = get_model_router().route("prompt_repair")
+    negative_line = '\n        NEGATIVE: "negative prompt"' if section == "PROMPT" else ""
+    return Task(
+        description=f"""Re-edit the draft below so it can be submitted as-is. Do not start over.
+
+        Draft:
+        {draft}
+
+        REQUIREMENTS:
+        1. Keep the subject, camera, lighting and style details that matter most
+        2. Remove repetition and filler words
+        3. The {section} text must be under {max_chars} characters (strictly!!!)
+        4. Return only the formatted result
+
+        Format as:
+        {section}: "edited prompt"{negative_line}""",
+        agent=get_agent(route.model),
+        expected_output=f"A {section} section under {max_chars} characters",
+        callback=route
+    )
+
+def create_prompt_repair_crew(task: Task) -> Crew:
+    """Create a single-agent crew for prompt repair"""
+    return Crew(
+        agents=[task.agent],
+        tasks=[task],
+        process=Process.sequential
+    )
\ No newline at end of file
@@ -4,6 +4,26 @@ from agents.research_agents import (
     get_market_researcher, get_business_planner,
     get_social_media_strategist
 )
+from services.model_router import get_model_router
+from services.research_cache import get_research_cache
+
+def create_segment_research_task(industry: str, target_market: str) -> Task:
+    """Create a business-agnostic research task for an industry segment, used to pre-warm the cache"""
+    route = get_model_router().route("market_research")
+    return Task(
+        description=f"""Research the current state of this market segment:
+        - Industry: {industry}
+        - Target: {target_market}
+        
+        Analyze:
+        1. Market Size & Growth
+        2. Key Competitors and their positioning
+        3. Target Audience needs and behaviour
+        4. Market Trends and recent developments""",
+        agent=get_market_researcher(route.model),
+        expected_output=f"A market segment report for {industry} targeting {target_market}",
+        callback=route
+    )
 
 def create_research_tasks(
     business_name: str,
@@ -13,6 +33,20 @@ def create_research_tasks(
 ) -> List[Task]:
     """Create tasks for market research and strategy"""
     
+    router = get_model_router()
+    research_route = router.route("market_research")
+    strategy_route = router.route("social_media_strategy")
+    plan_route = router.route("business_plan")
+    
+    segment_research = get_research_cache().get("segment", [industry, target_market])
+    background = ""
+    if segment_research:
+        background = f"""
+        
+        Background research already gathered for this segment. Build on it and only
+        search for what is missing or specific to {business_name}:
+        {segment_research}"""
+    
     market_research_task = Task(
         description=f"""Conduct targeted market research for {business_name} with scale-appropriate analysis:
         Business Context:
@@ -25,9 +59,10 @@ def create_research_tasks(
         1. Market Size & Growth
         2. Competitive Analysis
         3. Target Audience
-        4. Market Trends""",
-        agent=get_market_researcher(),
-        expected_output=f"A detailed market analysis report for {business_name}"
+        4. Market Trends{background}""",
+        agent=get_market_researcher(research_route.model),
+        expected_output=f"A detailed market analysis report for {business_name}",
+        callback=research_route
     )
 
     strategy_task = Task(
@@ -37,8 +72,9 @@ def create_research_tasks(
         2. Content Strategy
         3. Engagement Plan
         4. Growth Strategy""",
-        agent=get_social_media_strategist(),
-        expected_output=f"A social media strategy for {business_name}"
+        agent=get_social_media_strategist(strategy_route.model),
+        expected_output=f"A social media strategy for {business_name}",
+        callback=strategy_route
     )
 
     business_plan_task = Task(
@@ -47,8 +83,9 @@ def create_research_tasks(
         2. Financial Projections
         3. Implementation Timeline
         4. Risk Analysis""",
-        agent=get_business_planner(),
-        expected_output=f"A business plan for {business_name}"
+        agent=get_business_planner(plan_route.model),
+        expected_output=f"A business plan for {business_name}",
+        callback=plan_route
     )
 
     return [market_research_task, strategy_task, business_plan_task]
@@ -56,11 +93,7 @@ def create_research_tasks(
 def create_research_crew(tasks: List[Task]) -> Crew:
     """Create a crew for market research"""
     return Crew(
-        agents=[
-            get_market_researcher(),
-            get_social_media_strategist(),
-            get_business_planner()
-        ],
+        agents=[task.agent for task in tasks],
         tasks=tasks,
         verbose=True,
         process=Process.sequential
@@ -1,8 +1,10 @@
 from crewai import Task, Crew, Process
 from agents.video_agents import get_video_prompt_agent
+from services.model_router import get_model_router
 
 def create_video_prompt_task(business_idea: str, original_prompt: str) -> Task:
     """Create task for video prompt generation"""
+    route = get_model_router().route("video_prompt")
     return Task(
         description=f"""Create a cinematic video motion prompt (MAXIMUM 450 characters) that 
         emphasizes hyper-realism:
@@ -18,14 +20,15 @@ def create_video_prompt_task(business_idea: str, original_prompt: str) -> Task:
         5. Keep under 450 characters(strictly!!!)
         
         Format: VIDEO_PROMPT: "your cinematic prompt here" """,
-        agent=get_video_prompt_agent(),
-        expected_output="A cinematic video generation prompt under 450 characters"
+        agent=get_video_prompt_agent(route.model),
+        expected_output="A cinematic video generation prompt under 450 characters",
+        callback=route
     )
 
 def create_video_crew(task: Task) -> Crew:
     """Create a crew for video generation"""
     return Crew(
-        agents=[get_video_prompt_agent()],
+        agents=[task.agent],
         tasks=[task],
         process=Process.sequential
     )
\ No newline at end of file
@@ -0,0 +1,51 @@
+from services.prompt_compiler import (
+    LEONARDO_PROMPT_LIMIT, QUALITY_PREFIX, RUNWAY_PROMPT_LIMIT,
+    compile_leonardo_prompt, compile_video_prompt, parse_sections, trim_to_limit
+)
+
+def test_parse_sections_handles_markdown_bold():
+    sections = parse_sections('**PROMPT:** "a latte on a wooden table" **NEGATIVE:** "blurry"')
+    assert sections == {'PROMPT': "a latte on a wooden table", 'NEGATIVE': "blurry"}
+
+def test_parse_sections_normalizes_negative_prompt():
+    sections = parse_sections("PROMPT: a barista\nNEGATIVE PROMPT: watermark, text")
+    assert sections['NEGATIVE'] == "watermark, text"
+
+def test_parse_sections_without_section():
+    assert parse_sections("Here is a great idea for your shop.") == {}
+    assert compile_leonardo_prompt("Here is a great idea for your shop.") is None
+
+def test_repair_limit_leaves_room_for_quality_prefix():
+    limits = []
+
+    def repair(draft, limit):
+        limits.append(limit)
+        return "PROMPT: " + "a" * (limit - 10)
+
+    compiled = compile_leonardo_prompt("PROMPT: " + "word " * 120, repair=repair)
+    assert limits == [LEONARDO_PROMPT_LIMIT - len(QUALITY_PREFIX) - 2]
+    assert compiled['prompt'].startswith(QUALITY_PREFIX)
+    assert compiled['prompt'].endswith("a" * (limits[0] - 10))
+
+def test_repair_limit_is_full_when_draft_has_quality_terms():
+    limits = []
+
+    def repair(draft, limit):
+        limits.append(limit)
+        return ""
+
+    compile_leonardo_prompt("PROMPT: 8k photo, " + "word " * 120, repair=repair)
+    assert limits == [LEONARDO_PROMPT_LIMIT]
+
+def test_trim_keeps_whole_clauses():
+    assert trim_to_limit("red car, blue sky, green grass", 20) == "red car, blue sky"
+
+def test_trim_cuts_long_first_clause_at_word_boundary():
+    assert trim_to_limit("one two three four", 10) == "one two"
+
+def test_trim_slices_single_word_over_limit():
+    assert trim_to_limit("x" * 600, 500) == "x" * 500
+    assert compile_video_prompt("VIDEO_PROMPT: " + "x" * 600) == "x" * RUNWAY_PROMPT_LIMIT
+
+def test_trim_leaves_short_text_untouched():
+    assert trim_to_limit("  slow   dolly in ", 50) == "slow dolly in"
\ No newline at end of file